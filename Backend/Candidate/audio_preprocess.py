@@ -0,0 +1,123 @@
+import io
+import logging
+import os
+import tempfile
+from typing import BinaryIO, Optional, Union
+
+from pydub import AudioSegment
+from pydub.silence import detect_nonsilent
+
+logger = logging.getLogger(__name__)
+
+# ------------------ Configuration ------------------
+
+TARGET_SAMPLE_RATE = 16000
+SILENCE_THRESH_DBFS = float(os.getenv("AUDIO_SILENCE_THRESH_DBFS", "-45"))
+MIN_SILENCE_MS = int(os.getenv("AUDIO_MIN_SILENCE_MS", "400"))
+MIN_SPEECH_MS = int(os.getenv("AUDIO_MIN_SPEECH_MS", "300"))
+TRIM_PADDING_MS = 200
+
+
+class PreprocessedAudio:
+    """
+    Result of preprocessing one recording.
+    """
+
+    def __init__(self, data: bytes, filename: str, duration_ms: int, speech_ms: int):
+        self.data = data
+        self.filename = filename
+        self.duration_ms = duration_ms
+        self.speech_ms = speech_ms
+
+    @property
+    def is_silent(self) -> bool:
+        return self.speech_ms < MIN_SPEECH_MS
+
+
+def disk_path(source: BinaryIO) -> Optional[str]:
+    """
+    A path ffmpeg can open for a file object that already lives on disk, or None for
+    in-memory buffers (including a SpooledTemporaryFile that has not rolled over).
+
+    Anonymous temporary files are reached through /proc/<pid>/fd, so a rolled-over
+    spool is decoded from its existing file rather than a copy.
+    """
+    if isinstance(source, tempfile.SpooledTemporaryFile) and not source._rolled:
+        return None
+    name = getattr(source, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        return name
+    try:
+        fd = source.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+    path = f"/proc/{os.getpid()}/fd/{fd}"
+    return path if os.path.exists(path) else None
+
+
+def decode_audio(source: Union[bytes, BinaryIO], filename: str = "answer.webm") -> AudioSegment:
+    """
+    Decode a recording (bytes or a binary file object) into 16 kHz mono 16-bit audio.
+
+    Bytes and in-memory buffers are piped to ffmpeg from memory; a file on disk is
+    opened by ffmpeg from its path, so it is never read into memory here.
+    """
+    extension = os.path.splitext(filename)[1].lstrip(".").lower() or None
+    if isinstance(source, (bytes, bytearray)):
+        segment = AudioSegment.from_file(io.BytesIO(source), format=extension)
+    else:
+        segment = AudioSegment.from_file(disk_path(source) or source, format=extension)
+    return segment.set_channels(1).set_frame_rate(TARGET_SAMPLE_RATE).set_sample_width(2)
+
+
+def source_size(source: Union[bytes, BinaryIO]) -> int:
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    position = source.tell()
+    size = source.seek(0, os.SEEK_END)
+    source.seek(position)
+    return size
+
+
+def encode_audio(segment: AudioSegment) -> bytes:
+    """
+    Encode audio compactly (24 kbps Opus in Ogg) for transcription.
+    """
+    out = io.BytesIO()
+    segment.export(out, format="ogg", codec="libopus", bitrate="24k")
+    return out.getvalue()
+
+
+def speech_ranges(segment: AudioSegment):
+    """
+    Return [start_ms, end_ms] ranges that contain speech.
+    """
+    return detect_nonsilent(segment, min_silence_len=MIN_SILENCE_MS, silence_thresh=SILENCE_THRESH_DBFS)
+
+
+def preprocess_audio(source: Union[bytes, BinaryIO], filename: str = "answer.webm") -> Optional[PreprocessedAudio]:
+    """
+    Decode a browser recording, convert it to 16 kHz mono, trim leading/trailing
+    silence and re-encode it as low-bitrate Opus.
+
+    `source` is bytes or a binary file object positioned at the start; a file object
+    may be left at any position. Returns None when the audio cannot be decoded, so callers can
+    fall back to the original recording. CPU-bound: run it off the event loop.
+    """
+    try:
+        segment = decode_audio(source, filename)
+    except Exception as e:
+        logger.warning(f"Could not decode {filename} for preprocessing: {str(e)}")
+        return None
+    original_bytes = source_size(source)
+
+    speech = speech_ranges(segment)
+    speech_ms = sum(end - start for start, end in speech)
+    if speech_ms < MIN_SPEECH_MS:
+        return PreprocessedAudio(b"", filename, len(segment), speech_ms)
+
+    trimmed = segment[max(0, speech[0][0] - TRIM_PADDING_MS):min(len(segment), speech[-1][1] + TRIM_PADDING_MS)]
+    encoded = encode_audio(trimmed)
+    logger.info(f"Preprocessed {filename}: {original_bytes} -> {len(encoded)} bytes, "
+                f"{len(segment)} -> {len(trimmed)} ms ({speech_ms} ms speech)")
+    return PreprocessedAudio(encoded, "answer.ogg", len(segment), speech_ms)
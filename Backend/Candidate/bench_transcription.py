@@ -0,0 +1,89 @@
+"""
+Compare transcription backends on real answer recordings.
+
+Reports per-backend latency (mean / p50 / p95) and real-time factor
+(processing time divided by audio duration; below 1.0 is faster than real time).
+
+Usage:
+    python bench_transcription.py uploads/*.webm --backends api,local --runs 3
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from dotenv import load_dotenv
+from pydub import AudioSegment
+
+from llm_client import AsyncOpenAIClient
+from transcription import create_transcription_backend
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def bench_backend(name, client, recordings, runs, warmup):
+    backend = create_transcription_backend(name, client)
+    latencies, factors = [], []
+    try:
+        # Warm-up loads the local model in every worker so it is not billed to the first sample
+        for path, _, data in recordings[:warmup]:
+            await backend.transcribe(data, filename=os.path.basename(path))
+
+        for _ in range(runs):
+            for path, duration, data in recordings:
+                start = time.perf_counter()
+                await backend.transcribe(data, filename=os.path.basename(path))
+                elapsed = time.perf_counter() - start
+                latencies.append(elapsed)
+                factors.append(elapsed / duration if duration else 0.0)
+    finally:
+        await backend.aclose()
+
+    return {
+        "backend": name,
+        "samples": len(latencies),
+        "mean_s": statistics.mean(latencies),
+        "p50_s": percentile(latencies, 50),
+        "p95_s": percentile(latencies, 95),
+        "rtf": statistics.mean(factors),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark transcription backends")
+    parser.add_argument("files", nargs="+", help="audio recordings to transcribe")
+    parser.add_argument("--backends", default="api,local", help="comma-separated backend names")
+    parser.add_argument("--runs", type=int, default=3, help="passes over the recordings per backend")
+    parser.add_argument("--warmup", type=int, default=1, help="recordings transcribed before timing")
+    args = parser.parse_args()
+
+    load_dotenv("uri.env")
+    client = AsyncOpenAIClient(api_key=os.getenv("OPENAI_API_KEY", ""))
+
+    recordings = []
+    for path in args.files:
+        duration = AudioSegment.from_file(path).duration_seconds
+        if duration <= 0:
+            continue
+        with open(path, "rb") as f:
+            recordings.append((path, duration, f.read()))
+    total_audio = sum(duration for _, duration, _ in recordings)
+    print(f"{len(recordings)} recordings, {total_audio:.1f}s of audio")
+
+    print(f"{'backend':<8} {'samples':>7} {'mean_s':>8} {'p50_s':>8} {'p95_s':>8} {'rtf':>6}")
+    try:
+        for name in args.backends.split(","):
+            result = await bench_backend(name.strip(), client, recordings, args.runs, args.warmup)
+            print(f"{result['backend']:<8} {result['samples']:>7} {result['mean_s']:>8.3f} "
+                  f"{result['p50_s']:>8.3f} {result['p95_s']:>8.3f} {result['rtf']:>6.3f}")
+    finally:
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+import hashlib
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Tuple
+
+# Kept free of sibling-module imports so both Candidate/main.py and Backend/script.py can use it
+
+
+class BlobWriter:
+    """
+    Incrementally writes one blob, hashing and counting bytes as they arrive.
+    Call `commit()` to move it into place or `abort()` to discard it.
+    """
+
+    def __init__(self, store: "BlobStore"):
+        self.store = store
+        self.size = 0
+        self._sha = hashlib.sha256()
+        fd, self._temp_path = tempfile.mkstemp(dir=store._tmp_dir)
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes):
+        self._sha.update(chunk)
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> Tuple[str, bool]:
+        self._file.close()
+        digest = self._sha.hexdigest()
+        return digest, self.store._commit(self._temp_path, digest)
+
+    def abort(self):
+        self._file.close()
+        try:
+            os.remove(self._temp_path)
+        except FileNotFoundError:
+            pass
+
+
+class BlobStore:
+    """
+    Content-addressed blob store on local disk.
+
+    Blobs are keyed by their SHA-256 digest and stored under
+    <root>/<first 2 hex>/<next 2 hex>/<digest>, so identical uploads share one file and
+    survive restarts. Writes go to a temp file and are atomically renamed into place.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._tmp_dir = os.path.join(root, "tmp")
+        os.makedirs(self._tmp_dir, exist_ok=True)
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def _commit(self, temp_path: str, digest: str) -> bool:
+        target = self.path(digest)
+        if os.path.exists(target):
+            os.remove(temp_path)
+            return False
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(temp_path, target)
+        return True
+
+    def put(self, data: bytes) -> Tuple[str, bool]:
+        """
+        Store bytes and return (digest, created). `created` is False for a duplicate.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        if self.exists(digest):
+            return digest, False
+        fd, temp_path = tempfile.mkstemp(dir=self._tmp_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return digest, self._commit(temp_path, digest)
+
+    def put_file(self, fileobj: BinaryIO, chunk_size: int = 1024 * 1024) -> Tuple[str, bool]:
+        """
+        Store a binary file object without loading it whole; returns (digest, created).
+        """
+        writer = self.writer()
+        try:
+            while True:
+                chunk = fileobj.read(chunk_size)
+                if not chunk:
+                    break
+                writer.write(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.commit()
+
+    def writer(self) -> BlobWriter:
+        return BlobWriter(self)
+
+    @contextmanager
+    def open(self, digest: str) -> Iterator[memoryview]:
+        """
+        Memory-map a blob read-only. Pages are shared with the OS page cache, so
+        concurrent readers of the same CV do not each hold a private copy.
+        """
+        with open(self.path(digest), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def read(self, digest: str) -> bytes:
+        with self.open(digest) as view:
+            return bytes(view)
+
+    def delete(self, digest: str):
+        try:
+            os.remove(self.path(digest))
+        except FileNotFoundError:
+            pass
@@ -1,5 +1,5 @@
 import requests
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -16,6 +16,7 @@ load_dotenv()
 
 # Initialize FastAPI
 app = FastAPI()
+router = APIRouter()  # Endpoints; also mounted by server.py
 
 # Add CORS middleware (allow your frontend domain)
 app.add_middleware(
@@ -73,7 +74,7 @@ async def save_user_to_db(user_data):
 
 
 
-@app.post('/auth/github')
+@router.post('/auth/register/github')
 async def github_login(auth_request: GitHubAuthRequest):
     code = auth_request.code
     if not code:
@@ -120,7 +121,7 @@ async def github_login(auth_request: GitHubAuthRequest):
     }
 
 
-@app.post("/auth/google")
+@router.post("/auth/register/google")
 async def google_auth(data: TokenModel):
     try:
         # Verify the Google token
@@ -153,7 +154,7 @@ async def google_auth(data: TokenModel):
 
 
 
-@app.post("/auth/register")
+@router.post("/auth/register")
 async def register_user(data: UserModel):
     logger.info(f"Received registration data: {data.email}, {data.username}")
 
@@ -184,6 +185,8 @@ async def register_user(data: UserModel):
     logger.info(f"Registration successful for {data.email}")
     return {"message": "Registration successful", "user": result["user"]}
 
+app.include_router(router)
+
 # Run the server with uvicorn on all interfaces for external access
 if __name__ == "__main__":
     import uvicorn
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -15,6 +15,7 @@ load_dotenv()
 
 # Initialize FastAPI
 app = FastAPI()
+router = APIRouter()  # Endpoints; also mounted by server.py
 
 # Add CORS middleware
 app.add_middleware(
@@ -68,7 +69,7 @@ async def save_user_to_db(user_data):
     return {"message": "User registered successfully", "user": user_data}
 
 # Endpoint to check if email exists
-@app.post("/auth/check-email")
+@router.post("/auth/check-email")
 async def check_email(user: CheckEmailModel):
     logger.info(f"Incoming request payload: {user}")  # Debugging: Log the payload
     existing_user = await collection.find_one({"email": user.email})
@@ -77,7 +78,7 @@ async def check_email(user: CheckEmailModel):
     return {"exists": True}
 
 # Endpoint for manual login
-@app.post("/auth/signin")
+@router.post("/auth/signin")
 async def signin_user(user: UserModel):
     # Check if email exists
     existing_user = await collection.find_one({"email": user.email})
@@ -94,7 +95,7 @@ async def signin_user(user: UserModel):
     }
 
 # Endpoint for GitHub login
-@app.post("/auth/github")
+@router.post("/auth/github")
 async def github_login(auth_request: GitHubAuthRequest):
     code = auth_request.code
     if not code:
@@ -150,7 +151,7 @@ async def github_login(auth_request: GitHubAuthRequest):
     }
 
 # Endpoint for Google login
-@app.post("/auth/google")
+@router.post("/auth/google")
 async def google_auth(data: TokenModel):
     try:
         # Verify the Google token with a grace period for clock skew
@@ -186,6 +187,8 @@ async def google_auth(data: TokenModel):
         logger.error(f"Error during Google authentication: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error during Google authentication: {str(e)}")
 
+app.include_router(router)
+
 # Run FastAPI server (Only needed when you run it directly)
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,119 @@
+import re
+from typing import Dict, List
+
+# Kept free of sibling-module imports so both Candidate/main.py and Backend/script.py can use it
+
+# Canonical section -> headings that introduce it
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "about me", "objective", "career objective"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "competencies",
+               "technologies", "tools", "tech stack", "expertise"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects"],
+    "education": ["education", "academic background", "qualifications", "academic qualifications"],
+    "certifications": ["certifications", "certificates", "licenses", "courses"],
+    # Parsed so their content can be dropped
+    "ignored": ["references", "referees", "contact", "contact details", "personal details",
+                "personal information", "hobbies", "interests", "hobbies and interests", "declaration"],
+}
+_HEADING_LOOKUP = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+# Per-section limits for the digest (lines, characters per line)
+SECTION_LIMITS = {
+    "summary": (2, 300),
+    "experience": (12, 200),
+    "projects": (6, 180),
+    "education": (3, 150),
+    "certifications": (5, 100),
+}
+MAX_SKILLS = 40
+
+_NOISE = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.]+"           # email
+    r"|https?://\S+|www\.\S+"             # urls
+    r"|linkedin\.com\S*|github\.com\S*"
+)
+# Phone-number candidates; only removed with 9+ digits so date ranges survive
+_PHONE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_BULLET = re.compile(r"^[\s\-•●▪‣⁃*>➢·]+")
+_SKILL_SPLIT = re.compile(r"[,;|•●·]|\s{2,}")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for English prose (~4 characters per token).
+    """
+    return (len(text) + 3) // 4
+
+
+def _heading(line: str):
+    normalized = re.sub(r"[^a-z& ]", "", line.lower()).replace("&", "and").strip()
+    if not normalized or len(normalized.split()) > 4:
+        return None
+    return _HEADING_LOOKUP.get(normalized)
+
+
+def _clean(line: str) -> str:
+    line = _NOISE.sub("", line)
+    line = _PHONE.sub(lambda m: "" if sum(c.isdigit() for c in m.group()) >= 9 else m.group(), line)
+    line = _BULLET.sub("", line)
+    return " ".join(line.split())
+
+
+def split_sections(cv_text: str) -> Dict[str, List[str]]:
+    """
+    Split CV text into canonical sections. Lines before the first recognised
+    heading (usually name and contact details) are returned under "header".
+    """
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for raw_line in cv_text.splitlines():
+        section = _heading(raw_line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        line = _clean(raw_line)
+        if line:
+            sections.setdefault(current, []).append(line)
+    return sections
+
+
+def _skills(lines: List[str]) -> List[str]:
+    skills, seen = [], set()
+    for line in lines:
+        # "Languages: Python, Go" -> "Python, Go"
+        if ":" in line:
+            line = line.split(":", 1)[1]
+        for skill in _SKILL_SPLIT.split(line):
+            skill = skill.strip(" .")
+            if skill and len(skill) <= 40 and skill.lower() not in seen:
+                seen.add(skill.lower())
+                skills.append(skill)
+    return skills[:MAX_SKILLS]
+
+
+def build_cv_digest(cv_text: str, max_chars: int = 3000) -> str:
+    """
+    Build a compact skills/experience digest of a CV for use in LLM prompts.
+
+    Contact details, references, hobbies and formatting noise are dropped; if no
+    sections can be recognised the cleaned text is truncated instead.
+    """
+    sections = split_sections(cv_text)
+    parts = []
+
+    skills = _skills(sections.get("skills", []))
+    if skills:
+        parts.append("Skills: " + ", ".join(skills))
+
+    for section, (max_lines, max_len) in SECTION_LIMITS.items():
+        lines = sections.get(section, [])[:max_lines]
+        if lines:
+            parts.append(f"{section.capitalize()}:\n" + "\n".join(f"- {line[:max_len]}" for line in lines))
+
+    if not parts:
+        cleaned = " ".join(_clean(line) for line in cv_text.splitlines() if line.strip())
+        return cleaned[:max_chars]
+    return "\n".join(parts)[:max_chars]
@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import List, Optional
+
+import docx
+import fitz  # PyMuPDF
+
+try:
+    from upload_ingest import UploadRejected, ingest_cv_upload
+except ImportError:  # Imported as Candidate.cv_text by Backend/script.py
+    from Candidate.upload_ingest import UploadRejected, ingest_cv_upload
+
+logger = logging.getLogger(__name__)
+
+# ------------------ Configuration ------------------
+
+CV_MAX_PAGES = int(os.getenv("CV_MAX_PAGES", "50"))
+CV_MAX_CHARS = int(os.getenv("CV_MAX_CHARS", "100000"))
+CV_EXTRACT_WORKERS = int(os.getenv("CV_EXTRACT_WORKERS", "2"))
+# PDFs longer than this are split into page ranges extracted in parallel
+CV_PAGES_PER_TASK = int(os.getenv("CV_PAGES_PER_TASK", "8"))
+# Document types text can be extracted from
+CV_TEXT_EXTENSIONS = ("pdf", "docx")
+
+
+def open_pdf(source):
+    """
+    Open a PDF from a file path (read by MuPDF itself) or from bytes.
+    """
+    if isinstance(source, str):
+        return fitz.open(source, filetype="pdf")
+    return fitz.open(stream=source, filetype="pdf")
+
+# Function to count PDF pages
+def pdf_page_count(source) -> int:
+    with open_pdf(source) as doc:
+        return doc.page_count
+
+# Function to extract text from a range of PDF pages
+def extract_pdf_pages(source, start: int, stop: int) -> List[str]:
+    with open_pdf(source) as doc:
+        return [doc[i].get_text("text") for i in range(start, min(stop, doc.page_count))]
+
+# Function to extract text from PDF
+def extract_text_from_pdf(source, max_pages: int = CV_MAX_PAGES, max_chars: int = CV_MAX_CHARS):
+    pages = extract_pdf_pages(source, 0, max_pages)
+    return "".join(pages)[:max_chars]
+
+# Function to extract text from DOCX (a file path or bytes)
+def extract_text_from_docx(source, max_chars: int = CV_MAX_CHARS):
+    doc = docx.Document(source if isinstance(source, str) else BytesIO(source))
+    return "\n".join([para.text for para in doc.paragraphs])[:max_chars]
+
+
+class CVExtractionEngine:
+    """
+    Runs CV text extraction in a process pool, off the event loop and the GIL.
+
+    Workers are handed the document's path and open it themselves, so the file is
+    never pickled to them. Long PDFs are split into page ranges extracted in parallel
+    and joined once; output is capped at `max_pages` pages and `max_chars` characters. Timings for
+    recent documents are kept for the stats endpoint.
+    """
+
+    def __init__(
+        self,
+        workers: int = CV_EXTRACT_WORKERS,
+        max_pages: int = CV_MAX_PAGES,
+        max_chars: int = CV_MAX_CHARS,
+        pages_per_task: int = CV_PAGES_PER_TASK
+    ):
+        self.workers = workers
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.pages_per_task = pages_per_task
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.recent = deque(maxlen=100)
+        self.documents = 0
+        self.total_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def extract(self, path: str, extension: str, label: str = "") -> str:
+        """
+        Extract (capped) text from a PDF or DOCX file. Raises ValueError for unsupported formats.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        start = time.perf_counter()
+        pages = None
+
+        if extension == "pdf":
+            pages = min(await loop.run_in_executor(executor, pdf_page_count, path), self.max_pages)
+            ranges = [(i, min(i + self.pages_per_task, pages)) for i in range(0, pages, self.pages_per_task)]
+            chunks = await asyncio.gather(*(
+                loop.run_in_executor(executor, extract_pdf_pages, path, first, last)
+                for first, last in ranges
+            ))
+            text = "".join(page for chunk in chunks for page in chunk)[:self.max_chars]
+        elif extension == "docx":
+            text = await loop.run_in_executor(executor, extract_text_from_docx, path, self.max_chars)
+        else:
+            raise ValueError("Unsupported file format. Use PDF or DOCX.")
+
+        elapsed = time.perf_counter() - start
+        self.documents += 1
+        self.total_seconds += elapsed
+        self.recent.append({
+            "document": label,
+            "extension": extension,
+            "bytes": os.path.getsize(path),
+            "pages": pages,
+            "chars": len(text),
+            "seconds": round(elapsed, 4)
+        })
+        logger.info(f"Extracted {len(text)} characters from {label or extension} "
+                    f"({pages if pages is not None else '-'} pages) in {elapsed:.3f}s")
+        return text
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pages": self.max_pages,
+            "max_chars": self.max_chars,
+            "documents": self.documents,
+            "mean_seconds": round(self.total_seconds / self.documents, 4) if self.documents else 0.0,
+            "recent": list(self.recent)
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class CVTextCache:
+    """
+    Extracted CV text keyed by the blob's SHA-256.
+
+    Text is extracted at most once per unique document: results are kept in a small
+    in-memory LRU and persisted next to the blob as "<digest>.txt", and concurrent
+    requests for a document that is still being extracted share one task.
+    """
+
+    def __init__(self, blob_store, engine: CVExtractionEngine, max_entries: int = 256):
+        self.blob_store = blob_store
+        self.engine = engine
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _sidecar(self, digest: str) -> str:
+        return self.blob_store.path(digest) + ".txt"
+
+    def _remember(self, digest: str, text: str):
+        self._memory[digest] = text
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, digest: str) -> Optional[str]:
+        """
+        Return cached text for a document, or None if it has not been extracted yet.
+        """
+        if digest in self._memory:
+            self._memory.move_to_end(digest)
+            return self._memory[digest]
+        path = self._sidecar(digest)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            self._remember(digest, text)
+            return text
+        return None
+
+    def _write_sidecar(self, digest: str, text: str):
+        # Persist atomically so a crash never leaves a truncated cache entry
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self._sidecar(digest)))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, self._sidecar(digest))
+
+    async def _extract(self, digest: str, extension: str) -> str:
+        try:
+            # Blobs are immutable once committed, so workers can read the file directly
+            text = await self.engine.extract(self.blob_store.path(digest), extension, label=digest)
+            await asyncio.to_thread(self._write_sidecar, digest, text)
+            self._remember(digest, text)
+            return text
+        finally:
+            self._pending.pop(digest, None)
+
+    async def get_or_extract(self, digest: str, extension: str) -> str:
+        """
+        Return the document's text, extracting it (or joining an in-flight extraction) if needed.
+        """
+        text = self.get(digest)
+        if text is not None:
+            self.hits += 1
+            return text
+        self.misses += 1
+        if digest not in self._pending:
+            self._pending[digest] = asyncio.create_task(self._extract(digest, extension))
+        return await asyncio.shield(self._pending[digest])
+
+    def stats(self) -> dict:
+        return {
+            "cached_documents": len(self._memory),
+            "pending": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "engine": self.engine.stats()
+        }
+
+    def schedule(self, digest: str, extension: str):
+        """
+        Start background extraction for a newly uploaded document.
+        """
+        if digest in self._memory or digest in self._pending or os.path.exists(self._sidecar(digest)):
+            return
+        task = asyncio.create_task(self._extract(digest, extension))
+        self._pending[digest] = task
+
+        def log_failure(done: asyncio.Task):
+            if not done.cancelled() and done.exception() is not None:
+                logger.warning(f"Background CV extraction failed for {digest}: {str(done.exception())}")
+        task.add_done_callback(log_failure)
+
+
+async def resolve_cv_text(cv_texts: CVTextCache, record: Optional[dict] = None, file=None) -> str:
+    """
+    Return CV text for a stored upload `record` or a file sent with the request, using
+    the text cache so each unique document is only extracted once.
+
+    A file is type-checked before anything is stored and then goes through
+    ingest_cv_upload, so it gets the same size and content checks as /upload. Raises
+    UploadRejected (carrying the HTTP status) when neither is given or the type is unsupported.
+    """
+    if record is not None:
+        digest, extension = record["sha256"], record["extension"]
+    elif file is not None:
+        extension = os.path.splitext(file.filename or "")[1].lstrip(".").lower()
+        if extension not in CV_TEXT_EXTENSIONS:
+            raise UploadRejected("Unsupported file format. Use PDF or DOCX.")
+        digest, _, _ = await ingest_cv_upload(file, extension, cv_texts.blob_store)
+    else:
+        raise UploadRejected("Provide a CV file or a cv_id")
+
+    if extension not in CV_TEXT_EXTENSIONS:
+        raise UploadRejected("Unsupported file format. Use PDF or DOCX.")
+    return await cv_texts.get_or_extract(digest, extension)
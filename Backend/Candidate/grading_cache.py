@@ -0,0 +1,113 @@
+import asyncio
+import copy
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_answer(text: str) -> str:
+    """
+    Case-, punctuation- and whitespace-insensitive form of a question or transcription.
+    """
+    text = text.lower().replace("'", "").replace("\u2019", "")
+    return " ".join(_PUNCTUATION.sub(" ", text).split())
+
+
+class GradeCache:
+    """
+    LRU + TTL cache of answer gradings keyed by (question, normalized transcription).
+
+    Repeated submissions of the same answer (client retries, double submits, stock
+    answers such as "I don't know") return the stored result instead of another LLM
+    call, and concurrent gradings of the same pair share a single call. Error
+    results are never cached.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 24 * 60 * 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(question: str, transcription: str) -> str:
+        raw = normalize_answer(question) + "\0" + normalize_answer(transcription)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, question: str, transcription: str) -> Optional[dict]:
+        """
+        Return a copy of the cached grading, or None on a miss.
+        """
+        key = self.make_key(question, transcription)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] >= self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def put(self, question: str, transcription: str, result: dict):
+        if result.get("result") == "Error":
+            return
+        key = self.make_key(question, transcription)
+        self._entries[key] = (time.monotonic(), copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_grade(self, question: str, transcription: str,
+                           grade: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        Return the cached grading or await `grade()` (joining an identical in-flight grading) and cache it.
+        """
+        cached = self.get(question, transcription)
+        if cached is not None:
+            return cached
+        key = self.make_key(question, transcription)
+        if key in self._pending:
+            self.coalesced += 1
+            return copy.deepcopy(await asyncio.shield(self._pending[key]))
+
+        async def run():
+            try:
+                result = await grade()
+                self.put(question, transcription, result)
+                return result
+            finally:
+                self._pending.pop(key, None)
+
+        self._pending[key] = asyncio.ensure_future(run())
+        return copy.deepcopy(await asyncio.shield(self._pending[key]))
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "pending": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
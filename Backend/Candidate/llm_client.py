@@ -0,0 +1,183 @@
+import asyncio
+import json
+import logging
+import os
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# ------------------ Configuration ------------------
+
+OPENAI_API_BASE = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "64"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_CHAT_TIMEOUT = float(os.getenv("LLM_CHAT_TIMEOUT", "60"))
+LLM_TRANSCRIBE_TIMEOUT = float(os.getenv("LLM_TRANSCRIBE_TIMEOUT", "120"))
+
+
+class LLMClientError(Exception):
+    """
+    Raised when a call to the OpenAI API fails or times out.
+    """
+
+
+class AsyncOpenAIClient:
+    """
+    Non-blocking OpenAI client backed by one shared keep-alive connection pool.
+
+    The number of calls in flight is capped by a semaphore so a burst of
+    interviews queues here instead of opening unbounded sockets.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = OPENAI_API_BASE,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+        connect_timeout: float = LLM_CONNECT_TIMEOUT,
+        chat_timeout: float = LLM_CHAT_TIMEOUT,
+        transcribe_timeout: float = LLM_TRANSCRIBE_TIMEOUT,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.connect_timeout = connect_timeout
+        self.chat_timeout = chat_timeout
+        self.transcribe_timeout = transcribe_timeout
+        # Created lazily so they bind to the running event loop, not the import-time one
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=httpx.Timeout(self.chat_timeout, connect=self.connect_timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def _post(self, path: str, timeout: float, **kwargs) -> dict:
+        client = self._get_client()
+        async with self._semaphore:
+            try:
+                response = await client.post(
+                    path,
+                    timeout=httpx.Timeout(timeout, connect=self.connect_timeout),
+                    **kwargs
+                )
+            except httpx.TimeoutException as e:
+                raise LLMClientError(f"OpenAI request to {path} timed out after {timeout}s") from e
+            except httpx.HTTPError as e:
+                raise LLMClientError(f"OpenAI request to {path} failed: {str(e)}") from e
+
+        if response.status_code != 200:
+            raise LLMClientError(f"OpenAI API error: {response.status_code}, {response.text}")
+        return response.json()
+
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-3.5-turbo",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        timeout: Optional[float] = None,
+        **extra
+    ) -> dict:
+        """
+        Create a chat completion and return the raw response body.
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **extra
+        }
+        return await self._post(
+            "/chat/completions",
+            timeout or self.chat_timeout,
+            json=payload
+        )
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-3.5-turbo",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        timeout: Optional[float] = None,
+        **extra
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion, yielding content deltas as they arrive.
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+            **extra
+        }
+        timeout = timeout or self.chat_timeout
+        client = self._get_client()
+        async with self._semaphore:
+            try:
+                async with client.stream(
+                    "POST",
+                    "/chat/completions",
+                    json=payload,
+                    timeout=httpx.Timeout(timeout, connect=self.connect_timeout)
+                ) as response:
+                    if response.status_code != 200:
+                        body = (await response.aread()).decode(errors="replace")
+                        raise LLMClientError(f"OpenAI API error: {response.status_code}, {body}")
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        choices = json.loads(data).get("choices") or [{}]
+                        delta = choices[0].get("delta", {}).get("content")
+                        if delta:
+                            yield delta
+            except httpx.TimeoutException as e:
+                raise LLMClientError(f"OpenAI stream timed out after {timeout}s") from e
+            except httpx.HTTPError as e:
+                raise LLMClientError(f"OpenAI stream failed: {str(e)}") from e
+
+    async def transcribe(
+        self,
+        audio,
+        filename: str = "answer.webm",
+        model: str = "whisper-1",
+        language: str = "en",
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Transcribe an audio payload (bytes or a binary file object) and return the text.
+        """
+        data = await self._post(
+            "/audio/transcriptions",
+            timeout or self.transcribe_timeout,
+            data={"model": model, "language": language},
+            files={"file": (filename, audio)}
+        )
+        return data.get("text", "")
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
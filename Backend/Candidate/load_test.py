@@ -0,0 +1,152 @@
+"""
+Load-test the interview API end to end.
+
+Each virtual user starts an interview, then repeatedly fetches the next question
+and uploads an audio answer until the interview completes or the test ends.
+Reports per-endpoint count, errors, p50 / p95 / p99 latency and requests per second.
+
+Run the service against the local OpenAI stand-in so no API credit is spent:
+    python mock_openai.py --port 8100 --latency-ms 800
+    OPENAI_API_BASE=http://127.0.0.1:8100/v1 uvicorn main:app --port 8000
+    python load_test.py --base-url http://127.0.0.1:8000 --concurrency 50 --duration 60
+
+Every upload sends the same recording, but the stand-in returns a different
+transcription each time, so grading goes through the LLM path. To measure it with
+no local shortcuts at all, start the service with GRADE_CACHE_MAX_ENTRIES=0 and
+PRESCORE_ENABLED=0.
+"""
+import argparse
+import asyncio
+import io
+import math
+import random
+import struct
+import time
+import uuid
+import wave
+from collections import defaultdict
+
+import httpx
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def synthetic_answer(seconds: float = 3.0, sample_rate: int = 16000) -> bytes:
+    """
+    A mono 16-bit WAV of a modulated tone, loud enough not to be trimmed as silence.
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        frames = bytearray()
+        for n in range(int(seconds * sample_rate)):
+            envelope = 0.5 + 0.5 * math.sin(2 * math.pi * 3 * n / sample_rate)
+            sample = int(12000 * envelope * math.sin(2 * math.pi * 220 * n / sample_rate))
+            frames += struct.pack("<h", sample)
+        wav.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, audio: bytes, audio_name: str, args):
+        self.client = client
+        self.audio = audio
+        self.audio_name = audio_name
+        self.args = args
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.deadline = 0.0
+
+    async def call(self, name: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.latencies[name].append(time.perf_counter() - start)
+            self.errors[name] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+            return None
+        return response.json()
+
+    async def virtual_user(self, user: int):
+        while time.monotonic() < self.deadline:
+            # A unique role per interview bypasses the question-set cache
+            designation = (f"{self.args.designation} {uuid.uuid4().hex[:6]}"
+                           if self.args.unique_roles else self.args.designation)
+            started = await self.call("POST /interview/start", "POST", "/interview/start", json={
+                "designation": designation,
+                "experience": self.args.experience,
+                "difficulty": "medium"
+            })
+            if started is None:
+                await asyncio.sleep(0.1)
+                continue
+            session_id = started["session_id"]
+            question_number = 1
+            for _ in range(self.args.answers_per_interview):
+                if time.monotonic() >= self.deadline:
+                    return
+                await self.call("POST /interview/audio/upload", "POST", "/interview/audio/upload",
+                                data={"session_id": session_id, "question_number": str(question_number)},
+                                files={"file": (self.audio_name, self.audio)})
+                following = await self.call("GET /interview/{id}/next", "GET", f"/interview/{session_id}/next")
+                if following is None or following.get("is_complete"):
+                    break
+                question_number = following["question_number"]
+                if self.args.think_time:
+                    await asyncio.sleep(random.uniform(0, 2 * self.args.think_time))
+
+    async def run(self) -> float:
+        self.deadline = time.monotonic() + self.args.duration
+        start = time.perf_counter()
+        await asyncio.gather(*(self.virtual_user(user) for user in range(self.args.concurrency)))
+        return time.perf_counter() - start
+
+    def report(self, elapsed: float):
+        total = sum(len(values) for values in self.latencies.values())
+        print(f"{self.args.concurrency} virtual users for {elapsed:.1f}s: "
+              f"{total} requests, {total / elapsed:.1f} req/s")
+        print(f"{'endpoint':<28} {'count':>6} {'errors':>6} {'rps':>7} {'p50_s':>8} {'p95_s':>8} {'p99_s':>8}")
+        for name, values in sorted(self.latencies.items()):
+            print(f"{name:<28} {len(values):>6} {self.errors[name]:>6} {len(values) / elapsed:>7.2f} "
+                  f"{percentile(values, 50):>8.3f} {percentile(values, 95):>8.3f} {percentile(values, 99):>8.3f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load-test the interview API")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=20, help="number of virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="test length in seconds")
+    parser.add_argument("--answers-per-interview", type=int, default=20)
+    parser.add_argument("--think-time", type=float, default=0, help="mean pause between answers in seconds")
+    parser.add_argument("--designation", default="Software Engineer")
+    parser.add_argument("--experience", default="Mid-level")
+    parser.add_argument("--unique-roles", action="store_true", help="defeat the question cache")
+    parser.add_argument("--audio", help="answer recording to upload (default: synthetic WAV)")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    if args.audio:
+        with open(args.audio, "rb") as f:
+            audio, audio_name = f.read(), args.audio.rsplit("/", 1)[-1]
+    else:
+        audio, audio_name = synthetic_answer(), "answer.wav"
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        test = LoadTest(client, audio, audio_name, args)
+        elapsed = await test.run()
+    test.report(elapsed)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
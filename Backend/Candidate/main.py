@@ -1,34 +1,73 @@
 import os
 import json
+import asyncio
 import uuid
 from datetime import datetime
-from typing import List, Dict
+from typing import BinaryIO, List, Dict, Optional
 import speech_recognition as sr
 import logging
-from fastapi import FastAPI, HTTPException, File, UploadFile, Form
+from fastapi import APIRouter, FastAPI, HTTPException, File, UploadFile, Form, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from dotenv import load_dotenv
 import openai
-import subprocess
 import tempfile
-from pydub import AudioSegment
+import shutil
 import io
-import fitz  # PyMuPDF
-import docx
-from io import BytesIO
+from llm_client import AsyncOpenAIClient, LLMClientError
+from question_cache import QuestionSetCache
+from question_parser import DEFAULT_KEY_POINTS, QuestionStreamParser, parse_questions
+from scoring_jobs import CallbackNotAllowed, JobQueueFull, ScoringJobQueue
+from transcription import create_transcription_backend
+from audio_preprocess import preprocess_audio
+from streaming_transcription import IncrementalTranscriber, RecordingTooLarge
+from session_store import SessionNotFound, create_session_store, run_sweeper
+from blob_store import BlobStore
+from cv_text import CVExtractionEngine, CVTextCache, resolve_cv_text
+from upload_ingest import UploadRejected, UploadSizeLimitMiddleware, ingest_cv_upload
+from token_budget import TokenBudgeter
+from cv_digest import build_cv_digest
+from grading_cache import GradeCache
+from pre_scorer import AnswerPreScorer
+from metrics import StageMetrics
+from tracing import Tracer
+from structured_output import (BATCH_EVALUATION_SCHEMA, EVALUATION_SCHEMA, INTRO_SCRIPT_SCHEMA, QUESTION_SET_SCHEMA,
+                               ParseStats, SchemaError, load_json, parse_structured, validate)
 
 # ------------------ Setup & Configuration ------------------
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Data paths are resolved next to this file, not the working directory, so the app
+# behaves the same standalone and when mounted by ../server.py
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # Load environment variables from uri.env
-load_dotenv("uri.env")
+load_dotenv(os.path.join(BASE_DIR, "uri.env"))
 
-# Initialize FastAPI app
+# Initialize FastAPI app; endpoints live on `router` so server.py can mount them
+# alongside the other backend apps in one process
 app = FastAPI(title="Hired AI Interview Platform")
+router = APIRouter()
+
+# Per-request span trees; requests over TRACE_SLOW_THRESHOLD_MS are kept for /admin/traces/slow
+tracer = Tracer()
+# Per-stage latency histograms, outcome counters and in-flight gauges, scraped from /metrics
+# (each stage is also a span of the request's trace)
+metrics = StageMetrics(tracer=tracer)
+
+# Cap CV bodies (uploads and CVs attached to generation requests) while they are
+# received, with or without a Content-Length (registered before CORS so CORS stays
+# the outermost middleware)
+app.add_middleware(UploadSizeLimitMiddleware, paths=("/upload", "/generate_script"))
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    return await tracer.trace_request(request, call_next)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -37,8 +76,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Audio answers are transcribed straight from the spool Starlette fills while parsing
+# the form (in memory up to 1 MB, a temporary file above that); only queued answers
+# are copied, in chunks of this size, to a file of their own
+AUDIO_COPY_CHUNK = 256 * 1024
+# Resample/downmix/trim recordings before transcription and skip silent ones
+AUDIO_PREPROCESS = os.getenv("AUDIO_PREPROCESS", "1") == "1"
+
+# Result returned without calling the LLM when no speech was detected
+NO_ANSWER_RESULT = {
+    "result": "Incorrect",
+    "feedback": "No answer was detected in the recording.",
+    "score": 0
+}
+
 # Create uploads directory for audio files
-UPLOAD_DIR = "uploads"
+UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
 if not os.path.exists(UPLOAD_DIR):
     os.makedirs(UPLOAD_DIR)
 app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
@@ -50,9 +103,135 @@ if not openai.api_key:
     logger.error("OpenAI API key not found")
     raise Exception("OpenAI API key not found")
 
-# ------------------ In-memory Session Storage ------------------
-interview_sessions = {}
-uploaded_cvs = {}  # Dictionary to store uploaded CVs
+# Shared async client: one keep-alive pool for every interview on this worker
+llm_client = AsyncOpenAIClient(api_key=openai.api_key)
+
+# Speech-to-text backend, selectable per deployment ("api" = Whisper API, "local" = CPU model)
+transcriber = create_transcription_backend(os.getenv("TRANSCRIPTION_BACKEND", "api"), llm_client)
+
+@router.on_event("shutdown")
+async def close_llm_client():
+    await transcriber.aclose()
+    await llm_client.aclose()
+
+# ------------------ Session Storage ------------------
+# In-process by default; point SESSION_STORE_URL at Redis to share sessions across workers
+SESSION_STORE_URL = os.getenv("SESSION_STORE_URL", "memory://")
+# Idle expiry and in-process memory ceilings; 0 disables a limit
+SESSION_TTL = float(os.getenv("SESSION_TTL", str(2 * 60 * 60)))
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(256 * 1024 * 1024)))
+CV_TTL = float(os.getenv("CV_TTL", str(24 * 60 * 60)))
+CV_MAX_BYTES = int(os.getenv("CV_MAX_BYTES", str(512 * 1024 * 1024)))
+SESSION_SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", "60"))
+
+interview_sessions = create_session_store(
+    SESSION_STORE_URL, "interview", item_fields=("answers",),
+    ttl_seconds=SESSION_TTL, max_bytes=SESSION_MAX_BYTES
+)
+uploaded_cvs = create_session_store(  # Store for uploaded CVs
+    SESSION_STORE_URL, "cv", ttl_seconds=CV_TTL, max_bytes=CV_MAX_BYTES
+)
+session_sweeper = None
+
+# Content-addressed CV bytes on disk (sha256 -> file), shared by duplicate uploads
+blob_store = BlobStore(os.getenv("CV_BLOB_DIR", os.path.join(BASE_DIR, "cv_blobs")))
+# Extracted CV text, computed once per unique document
+cv_texts = CVTextCache(blob_store, CVExtractionEngine())
+
+@router.on_event("startup")
+async def start_session_sweeper():
+    global session_sweeper
+    session_sweeper = asyncio.create_task(run_sweeper([interview_sessions, uploaded_cvs], SESSION_SWEEP_INTERVAL))
+
+@router.on_event("shutdown")
+async def close_session_stores():
+    if session_sweeper is not None:
+        session_sweeper.cancel()
+    await interview_sessions.close()
+    await uploaded_cvs.close()
+
+# Generated question sets reused across sessions for the same role/level/difficulty
+question_cache = QuestionSetCache(
+    max_keys=int(os.getenv("QUESTION_CACHE_MAX_KEYS", "256")),
+    ttl_seconds=float(os.getenv("QUESTION_CACHE_TTL", "3600")),
+    variants_per_key=int(os.getenv("QUESTION_CACHE_VARIANTS", "3"))
+)
+
+# Upper bound on one score-all run; a lease left by a crashed worker expires after this
+SCORE_ALL_LEASE_SECONDS = float(os.getenv("SCORE_ALL_LEASE_SECONDS", "600"))
+
+# Number of answers graded per batch-evaluation LLM call
+EVALUATION_BATCH_SIZE = int(os.getenv("EVALUATION_BATCH_SIZE", "10"))
+# Most answers one /interview/evaluate/batch request may grade (bounds its LLM fan-out)
+EVALUATION_MAX_ANSWERS = int(os.getenv("EVALUATION_MAX_ANSWERS", "50"))
+
+# Prompt-token budgets per LLM call site; over-long transcriptions are truncated to fit
+PROMPT_BUDGETS = {
+    "questions": int(os.getenv("PROMPT_BUDGET_QUESTIONS", "3000")),
+    "validate_answer": int(os.getenv("PROMPT_BUDGET_VALIDATE_ANSWER", "1500")),
+    "evaluate_batch": int(os.getenv("PROMPT_BUDGET_EVALUATE_BATCH", "12000")),
+    "intro_script": int(os.getenv("PROMPT_BUDGET_INTRO_SCRIPT", "1500"))
+}
+# Cap on each client-supplied field (designation, experience) in question prompts
+QUESTION_FIELD_MAX_TOKENS = int(os.getenv("QUESTION_FIELD_MAX_TOKENS", "50"))
+# Per-answer cap inside batch evaluation prompts
+ANSWER_MAX_TOKENS = int(os.getenv("ANSWER_MAX_TOKENS", "1000"))
+prompt_budget = TokenBudgeter(PROMPT_BUDGETS)
+
+# Gradings reused for repeated (question, normalized transcription) pairs
+grade_cache = GradeCache(
+    max_entries=int(os.getenv("GRADE_CACHE_MAX_ENTRIES", "10000")),
+    ttl_seconds=float(os.getenv("GRADE_CACHE_TTL", str(24 * 60 * 60)))
+)
+
+# Local first pass that scores near-empty answers without the LLM (low-overlap
+# answers are only counted; they are still graded by the LLM)
+PRESCORE_ENABLED = os.getenv("PRESCORE_ENABLED", "1") == "1"
+pre_scorer = AnswerPreScorer(
+    min_words=int(os.getenv("PRESCORE_MIN_WORDS", "3")),
+    low_overlap_similarity=float(os.getenv("PRESCORE_LOW_OVERLAP_SIMILARITY", "0.05")),
+    max_references=int(os.getenv("PRESCORE_MAX_REFERENCES", "2000"))
+)
+
+# Background scoring for /interview/audio/upload_async (handler is defined below)
+scoring_jobs = ScoringJobQueue(
+    handler=lambda payload: score_audio_job(payload),
+    workers=int(os.getenv("SCORING_WORKERS", "8")),
+    max_pending=int(os.getenv("SCORING_MAX_PENDING", "200")),
+    result_ttl=float(os.getenv("SCORING_RESULT_TTL", "3600")),
+    # Comma-separated origins (e.g. "https://hooks.example.com") that may receive
+    # job callbacks; empty disables callback_url
+    callback_origins=[
+        origin for origin in os.getenv("SCORING_CALLBACK_ORIGINS", "").split(",") if origin.strip()
+    ]
+)
+
+@router.on_event("startup")
+async def start_scoring_workers():
+    await scoring_jobs.start()
+
+@router.on_event("shutdown")
+async def stop_scoring_workers():
+    await scoring_jobs.stop()
+
+# Ask for JSON (response_format=json_object) validated against a schema instead of
+# scanning free text for "Qn:"/"Score:" lines; 0 restores the text formats for comparison
+STRUCTURED_OUTPUT = os.getenv("STRUCTURED_OUTPUT", "1") == "1"
+# Extra grading calls allowed when a completion cannot be parsed
+GRADING_PARSE_RETRIES = int(os.getenv("GRADING_PARSE_RETRIES", "1"))
+parse_stats = ParseStats("json" if STRUCTURED_OUTPUT else "text")
+
+# Bounded top-up retries when a completion yields fewer than 20 questions
+QUESTION_MAX_RETRIES = int(os.getenv("QUESTION_MAX_RETRIES", "3"))
+QUESTION_RETRY_BACKOFF = float(os.getenv("QUESTION_RETRY_BACKOFF", "0.5"))
+question_generation_stats = {
+    "requests": 0,
+    "llm_calls": 0,
+    "retries": 0,
+    "topped_up_questions": 0,
+    "failed_calls": 0,
+    "exhausted": 0
+}
 
 # ------------------ Pydantic Models ------------------
 class InterviewRequest(BaseModel):
@@ -68,48 +247,51 @@ class AudioResponse(BaseModel):
     score: int
     total_score: int
 
+class AnswerEvaluationItem(BaseModel):
+    question: str
+    transcription: str
+    model_answer: Optional[str] = None
 
-def extract_text_from_pdf(pdf_file_bytes):
-    doc = fitz.open(stream=pdf_file_bytes, filetype="pdf")
-    text = ""
-    for page in doc:
-        text += page.get_text("text")
-    return text
-
-# Function to extract text from DOCX
-def extract_text_from_docx(docx_file_bytes):
-    doc = docx.Document(BytesIO(docx_file_bytes))
-    return "\n".join([para.text for para in doc.paragraphs])
+class BatchEvaluationRequest(BaseModel):
+    answers: List[AnswerEvaluationItem]
 
-# ------------------ API Endpoints ------------------
 
-@app.post("/generate_script")
-async def generate_script(file: UploadFile = File(...)):
+@tracer.traced()
+async def load_cv_text(file: Optional[UploadFile], cv_id: Optional[str]) -> str:
+    """
+    Return CV text for a previously uploaded `cv_id` or a file sent with the request.
+    """
+    record = None
+    if cv_id:
+        with metrics.stage("session_lookup"):
+            record = await uploaded_cvs.get(cv_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail="CV not found")
     try:
-        # Read the file content
-        file_content = await file.read()  
+        with metrics.stage("cv_text_extraction"):
+            return await resolve_cv_text(cv_texts, record, file)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-        # Determine file type and extract text
-        file_extension = file.filename.split('.')[-1].lower()
+# ------------------ API Endpoints ------------------
 
-        if file_extension == 'pdf':
-            text = extract_text_from_pdf(file_content)
-        elif file_extension == 'docx':
-            text = extract_text_from_docx(file_content)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format. Use PDF or DOCX.")
+@router.post("/generate_script")
+async def generate_script(file: Optional[UploadFile] = File(None), cv_id: Optional[str] = Form(None)):
+    try:
+        # Use cached text for an uploaded CV (cv_id) or extract it from the attached file
+        text = await load_cv_text(file, cv_id)
 
-        # Generate interview questions based on CV content
-        questions = generate_interview_questions(text)
-        
-        # Send the generated questions back in the response
-        return {"questions": questions}
+        # Write the candidate's introduction script from the CV content
+        script = await generate_intro_script(text)
+        return {"script": script}
 
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"Error generating script: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/upload")
+@router.post("/upload")
 async def upload_cv(file: UploadFile = File(...)) -> Dict[str, str]:
     """
     Upload a CV file and store it for later use.
@@ -120,16 +302,6 @@ async def upload_cv(file: UploadFile = File(...)) -> Dict[str, str]:
         if not file:
             raise HTTPException(status_code=400, detail="No file provided")
 
-        # Validate file size (5MB limit)
-        file_size = 0
-        content = await file.read()
-        file_size = len(content)
-        if file_size > 5 * 1024 * 1024:  # 5MB
-            raise HTTPException(status_code=400, detail="File size too large. Maximum size is 5MB")
-
-        # Reset file pointer
-        await file.seek(0)
-
         # Validate file extension
         file_extension = file.filename.split(".")[-1].lower()
         if file_extension not in ["pdf", "doc", "docx"]:
@@ -154,15 +326,27 @@ async def upload_cv(file: UploadFile = File(...)) -> Dict[str, str]:
         # Generate a unique ID for the CV
         cv_id = str(uuid.uuid4())
 
-        # Store the CV content and metadata
-        uploaded_cvs[cv_id] = {
+        # Stream the body into the blob store, rejecting it as soon as it is too large
+        # or its leading bytes do not match the extension; the record keeps only metadata and the hash
+        try:
+            sha256, file_size, created = await ingest_cv_upload(file, file_extension, blob_store)
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        if not created:
+            logger.info(f"CV {file.filename} matches stored blob {sha256}, reusing it")
+        if file_extension in ("pdf", "docx"):
+            # Extract the text in the background so question generation can use it immediately
+            cv_texts.schedule(sha256, file_extension)
+
+        # Store the CV metadata
+        await uploaded_cvs.set(cv_id, {
             "filename": file.filename,
-            "content": content,
+            "sha256": sha256,
             "content_type": content_type,
             "extension": file_extension,
             "size": file_size,
             "upload_time": datetime.now().isoformat()
-        }
+        })
 
         logger.info(f"Successfully uploaded CV: {file.filename} (ID: {cv_id})")
         return {
@@ -183,98 +367,208 @@ async def upload_cv(file: UploadFile = File(...)) -> Dict[str, str]:
         )
 # ------------------ Helper Functions ------------------
 
-def generate_interview_questions(designation: str, experience: str, difficulty: str = "medium") -> List[dict]:
+# Output format instructions for each mode ({designation} is filled in by build_question_messages)
+QUESTION_TEXT_FORMAT = """Format each Q&A pair exactly as:
+    Q1: [Brief, focused question specific to {designation}]
+    A1: [Clear, concise answer with key points]
+
+    Example format for a Cyber Security Engineer:
+    Q1: How would you respond to a detected zero-day exploit in a production environment?
+    A1: 1) Isolate affected systems 2) Analyze exploit pattern 3) Apply temporary mitigation 4) Work with vendors for patch 5) Monitor for similar patterns"""
+
+QUESTION_JSON_FORMAT = """Respond with only a JSON object of exactly this form:
+    {"questions": [{"question": "<brief, focused question specific to {designation}>", "answer": "<clear, concise answer with key points>"}]}
+
+    Example item for a Cyber Security Engineer:
+    {"question": "How would you respond to a detected zero-day exploit in a production environment?", "answer": "1) Isolate affected systems 2) Analyze exploit pattern 3) Apply temporary mitigation 4) Work with vendors for patch 5) Monitor for similar patterns"}"""
+
+EVALUATION_TEXT_FORMAT = """Format your response exactly as:
+        Score: [number]/10
+        Feedback: [your feedback]
+        Assessment: [Correct/Partial/Incorrect]"""
+
+EVALUATION_JSON_FORMAT = """Respond with only a JSON object of exactly this form:
+        {"score": <integer 0-10>, "feedback": "<your feedback>", "assessment": "Correct" | "Partial" | "Incorrect"}"""
+
+BATCH_EVALUATION_TEXT_FORMAT = """For every answer provide a block formatted exactly as:
+    Answer [n]:
+    Score: [number]/10
+    Feedback: [your feedback]
+    Assessment: [Correct/Partial/Incorrect]"""
+
+BATCH_EVALUATION_JSON_FORMAT = """Respond with only a JSON object with one entry per answer, of exactly this form:
+    {"evaluations": [{"answer": <n>, "score": <integer 0-10>, "feedback": "<your feedback>", "assessment": "Correct" | "Partial" | "Incorrect"}]}"""
+
+def build_question_messages(designation: str, experience: str, difficulty: str = "medium",
+                            count: int = 20, asked: str = "",
+                            structured: bool = STRUCTURED_OUTPUT) -> List[dict]:
     """
-    Generate 20 brief interview questions using OpenAI based on experience and difficulty.
+    Build the chat messages that ask the model for `count` role-specific Q&A pairs,
+    optionally excluding questions that were already generated (`asked`, one "- ..." line each).
+
+    With `structured` the pairs are requested as a JSON object, otherwise as "Qn:/An:" lines.
     """
-    try:
-        logger.info(f"Generating questions for {designation} ({experience} level)")
+    # Create a more specific system prompt based on the role
+    system_prompt = f"""You are an expert technical interviewer specializing in {designation} positions.
+    Your task is to generate technical interview questions that are:
+    1. Specifically tailored for a {designation} role
+    2. Appropriate for {experience} experience level
+    3. Set at {difficulty} difficulty
+    4. Focused on real-world scenarios and practical knowledge
+    5. Cover both technical skills and problem-solving abilities specific to {designation}"""
+
+    # Prepare the role-specific prompt
+    prompt = f"""Generate exactly {count} unique technical interview questions for a {experience} {designation}.
+
+    Requirements:
+    1. Questions MUST be specifically focused on {designation} role
+    2. Include questions about:
+       - Core technical concepts for {designation}
+       - Industry best practices in {designation} field
+       - Common tools and technologies used in {designation} role
+       - Security and compliance (if relevant)
+       - Problem-solving scenarios specific to {designation}
+    3. Difficulty level: {difficulty}
+    4. Experience level: {experience}
+    5. Each question must be unique and not generic
+    6. Include practical, real-world scenarios
 
-        # Create a more specific system prompt based on the role
-        system_prompt = f"""You are an expert technical interviewer specializing in {designation} positions.
-        Your task is to generate technical interview questions that are:
-        1. Specifically tailored for a {designation} role
-        2. Appropriate for {experience} experience level
-        3. Set at {difficulty} difficulty
-        4. Focused on real-world scenarios and practical knowledge
-        5. Cover both technical skills and problem-solving abilities specific to {designation}"""
-
-        # Prepare the role-specific prompt
-        prompt = f"""Generate exactly 20 unique technical interview questions for a {experience} {designation}.
-
-        Requirements:
-        1. Questions MUST be specifically focused on {designation} role
-        2. Include questions about:
-           - Core technical concepts for {designation}
-           - Industry best practices in {designation} field
-           - Common tools and technologies used in {designation} role
-           - Security and compliance (if relevant)
-           - Problem-solving scenarios specific to {designation}
-        3. Difficulty level: {difficulty}
-        4. Experience level: {experience}
-        5. Each question must be unique and not generic
-        6. Include practical, real-world scenarios
-
-        Format each Q&A pair exactly as:
-        Q1: [Brief, focused question specific to {designation}]
-        A1: [Clear, concise answer with key points]
-
-        Example format for a Cyber Security Engineer:
-        Q1: How would you respond to a detected zero-day exploit in a production environment?
-        A1: 1) Isolate affected systems 2) Analyze exploit pattern 3) Apply temporary mitigation 4) Work with vendors for patch 5) Monitor for similar patterns
-
-        Generate exactly 20 questions following this format, ensuring each is highly relevant to {designation} role."""
-
-        # Make API call with role-specific prompts
-        response = openai.ChatCompletion.create(
+    {QUESTION_JSON_FORMAT if structured else QUESTION_TEXT_FORMAT}
+
+    Generate exactly {count} questions following this format, ensuring each is highly relevant to {designation} role."""
+
+    if asked:
+        prompt += f"""
+
+    Do not repeat or rephrase any of these questions:
+{asked}"""
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt.replace("{designation}", designation)}
+    ]
+
+def fit_question_messages(designation: str, experience: str, difficulty: str = "medium",
+                          count: int = 20, exclude: List[dict] = None,
+                          structured: bool = STRUCTURED_OUTPUT) -> List[dict]:
+    """
+    Build the question-generation messages within the "questions" prompt budget.
+
+    Designation and experience come from the client and are repeated throughout the
+    prompt, so each is clipped to QUESTION_FIELD_MAX_TOKENS; the list of questions to
+    avoid (which grows with every regeneration) is then truncated to the budget left.
+    """
+    designation = prompt_budget.clip("questions", designation, QUESTION_FIELD_MAX_TOKENS)
+    experience = prompt_budget.clip("questions", experience, QUESTION_FIELD_MAX_TOKENS)
+    asked = "\n".join(f"- {q['question']}" for q in exclude or [])
+    return prompt_budget.fit(
+        "questions",
+        lambda text: build_question_messages(designation, experience, difficulty, count, text, structured),
+        asked
+    )
+
+def parse_question_response(content: str) -> List[dict]:
+    """
+    Parse a question-set completion in the configured format. JSON items that do not
+    match the schema are dropped individually so the rest of the set is kept.
+    """
+    if not STRUCTURED_OUTPUT:
+        return parse_questions(content)
+    data = load_json(content)
+    validate(data, {"type": "object", "required": ["questions"], "properties": {"questions": {"type": "array"}}})
+    questions = []
+    for item in data["questions"]:
+        try:
+            validate(item, QUESTION_SET_SCHEMA["properties"]["questions"]["items"])
+        except SchemaError as e:
+            logger.warning(f"Dropping malformed question item: {str(e)}")
+            continue
+        questions.append({
+            'question': item['question'].strip(),
+            'key_points': list(DEFAULT_KEY_POINTS),
+            'model_answer': item['answer'].strip()
+        })
+    return questions
+
+async def request_questions(designation: str, experience: str, difficulty: str,
+                            count: int, exclude: List[dict]) -> List[dict]:
+    """
+    Make one completion call for `count` questions and return the parsed pairs.
+    """
+    question_generation_stats["llm_calls"] += 1
+    messages = fit_question_messages(designation, experience, difficulty, count, exclude)
+    # ~100 tokens per Q&A pair, matching the original 2000 for a full set
+    max_tokens = min(2000, 100 * count + 100)
+    with metrics.stage("llm_call:questions"):
+        response = await llm_client.chat_completion(
             model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=max_tokens,
+            **({"response_format": {"type": "json_object"}} if STRUCTURED_OUTPUT else {})
         )
+    prompt_budget.record("questions", messages, max_tokens, response)
+    parse_stats.completion("questions")
 
-        # Extract content from response
-        content = response.choices[0].message.content
-        lines = content.strip().split('\n')
+    # Extract questions and answers from the response
+    content = response["choices"][0]["message"]["content"]
+    try:
+        with metrics.stage("question_parse"):
+            questions = parse_question_response(content)
+    except SchemaError as e:
+        logger.warning(f"Could not parse question set: {str(e)}")
         questions = []
-        current_question = None
+    # A short set costs a top-up round trip just like an unparseable one
+    if len(questions) < count:
+        parse_stats.failure("questions")
+    return questions
 
-        # Process lines to extract questions and answers
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Match Q1-Q20 format
-            if line.startswith('Q') and ':' in line and any(str(i) in line[:3] for i in range(1, 21)):
-                if current_question:
-                    questions.append(current_question)
-                question_text = line.split(':', 1)[1].strip()
-                current_question = {
-                    'question': question_text,
-                    'key_points': ['Role-specific knowledge', 'Technical accuracy', 'Practical application']
-                }
-            # Match A1-A20 format
-            elif line.startswith('A') and ':' in line and any(str(i) in line[:3] for i in range(1, 21)) and current_question:
-                answer_text = line.split(':', 1)[1].strip()
-                current_question['model_answer'] = answer_text
-                questions.append(current_question)
-                current_question = None
-
-        # Add the last question if it exists
-        if current_question and 'model_answer' in current_question:
-            questions.append(current_question)
-
-        # Ensure we have exactly 20 questions
-        if len(questions) < 20:
-            logger.warning(f"Generated only {len(questions)} questions, retrying with modified prompt")
-            # Retry once with a modified prompt
-            return generate_interview_questions(designation, experience, difficulty)
-        
-        questions = questions[:20]  # Limit to exactly 20 questions
+@tracer.traced()
+async def generate_interview_questions(designation: str, experience: str, difficulty: str = "medium",
+                                       existing: List[dict] = None) -> List[dict]:
+    """
+    Generate 20 brief interview questions using OpenAI based on experience and difficulty.
+
+    Questions already parsed (`existing`, or from earlier attempts) are kept; each retry
+    only asks for the missing ones, up to QUESTION_MAX_RETRIES times with backoff.
+    """
+    try:
+        logger.info(f"Generating questions for {designation} ({experience} level)")
+        question_generation_stats["requests"] += 1
+
+        questions = list(existing or [])
+        seen = {q['question'].lower() for q in questions}
+        attempt = 0
+        while len(questions) < 20:
+            missing = 20 - len(questions)
+            is_retry = attempt > 0 or bool(existing)
+            if is_retry:
+                question_generation_stats["retries"] += 1
+            if attempt > 0:
+                parse_stats.retry("questions")
+            try:
+                batch = await request_questions(designation, experience, difficulty, missing, questions)
+            except LLMClientError as e:
+                question_generation_stats["failed_calls"] += 1
+                logger.warning(f"Question generation call failed: {str(e)}")
+                batch = []
+
+            for q in batch:
+                if q['question'].lower() not in seen and len(questions) < 20:
+                    seen.add(q['question'].lower())
+                    questions.append(q)
+                    if is_retry:
+                        question_generation_stats["topped_up_questions"] += 1
+
+            if len(questions) >= 20:
+                break
+            if attempt >= QUESTION_MAX_RETRIES:
+                question_generation_stats["exhausted"] += 1
+                raise Exception(f"Generated only {len(questions)} questions after {attempt} retries")
+
+            attempt += 1
+            logger.warning(f"Generated only {len(questions)} questions, requesting the missing {20 - len(questions)} (retry {attempt}/{QUESTION_MAX_RETRIES})")
+            await asyncio.sleep(QUESTION_RETRY_BACKOFF * 2 ** (attempt - 1))
         
         # Validate questions
         if not questions:
@@ -292,13 +586,140 @@ def generate_interview_questions(designation: str, experience: str, difficulty:
         logger.error(f"Error in generate_interview_questions: {str(e)}")
         raise Exception(f"Failed to generate interview questions: {str(e)}")
 
-def validate_answer(transcription: str, question_data: dict) -> dict:
+def parse_evaluation(evaluation: str) -> dict:
     """
-    Validate the user's answer using OpenAI.
+    Parse a "Score:/Feedback:/Assessment:" block into a validation result.
+    Raises IndexError/ValueError when a line is missing or malformed.
     """
-    try:
-        prompt = f"""
-        Question: {question_data['question']}
+    lines = [line.strip() for line in evaluation.split('\n')]
+
+    # Extract score
+    score_line = [line for line in lines if line.startswith('Score:')][0]
+    score = int(score_line.split('/')[0].split(':')[1].strip())
+
+    # Extract feedback
+    feedback_line = [line for line in lines if line.startswith('Feedback:')][0]
+    feedback = feedback_line.split(':', 1)[1].strip()
+
+    # Extract assessment
+    assessment_line = [line for line in lines if line.startswith('Assessment:')][0]
+    result = assessment_line.split(':', 1)[1].strip()
+
+    return {
+        "result": result,
+        "feedback": feedback,
+        "score": score
+    }
+
+def evaluation_result(data: dict) -> dict:
+    """
+    Convert a schema-validated JSON evaluation into a validation result.
+    """
+    return {
+        "result": data["assessment"],
+        "feedback": data["feedback"].strip(),
+        "score": data["score"]
+    }
+
+def parse_evaluation_response(content: str) -> dict:
+    """
+    Parse a single-answer grading completion in the configured format.
+    """
+    if STRUCTURED_OUTPUT:
+        return evaluation_result(parse_structured(content, EVALUATION_SCHEMA))
+    return parse_evaluation(content)
+
+def parse_batch_evaluation(content: str) -> Dict[int, dict]:
+    """
+    Parse a batch grading completion into {answer number: validation result}.
+    Entries that cannot be parsed are left out.
+    """
+    results = {}
+    if STRUCTURED_OUTPUT:
+        data = load_json(content)
+        validate(data, {"type": "object", "required": ["evaluations"], "properties": {"evaluations": {"type": "array"}}})
+        for item in data["evaluations"]:
+            try:
+                validate(item, BATCH_EVALUATION_SCHEMA["properties"]["evaluations"]["items"])
+            except SchemaError as e:
+                logger.warning(f"Dropping malformed evaluation item: {str(e)}")
+                continue
+            results[item["answer"]] = evaluation_result(item)
+        return results
+
+    # Split the completion into per-answer blocks
+    blocks = {}
+    current = None
+    for line in content.split('\n'):
+        header = line.strip().rstrip(':')
+        if header.startswith('Answer ') and header[len('Answer '):].strip().isdigit():
+            current = int(header[len('Answer '):].strip())
+            blocks[current] = []
+        elif current is not None:
+            blocks[current].append(line)
+    for number, lines in blocks.items():
+        try:
+            results[number] = parse_evaluation("\n".join(lines))
+        except (IndexError, ValueError):
+            continue
+    return results
+
+
+def build_intro_script_messages(cv_digest: str) -> List[dict]:
+    """
+    Build the chat messages that turn a CV digest into an interview introduction script.
+    """
+    prompt = f"""
+        Based on the following CV summary, write a short first-person introduction (about
+        150-200 words) the candidate can use when an interviewer says "tell me about yourself".
+        Highlight their most relevant experience and skills. Then give brief overall feedback
+        on how the CV presents them and what to emphasise.
+
+        CV Summary:
+        {cv_digest}
+
+        Respond with only a JSON object of exactly this form:
+        {{"personalized_intro": "<the introduction script>", "overall_feedback": "<your feedback>"}}
+        """
+
+    return [
+        {"role": "system", "content": "You are an experienced career coach preparing a candidate for interviews."},
+        {"role": "user", "content": prompt}
+    ]
+
+@tracer.traced()
+async def generate_intro_script(cv_text: str) -> dict:
+    """
+    Generate the personalized introduction script and CV feedback shown on the CV upload page.
+    """
+    messages = prompt_budget.fit("intro_script", build_intro_script_messages, build_cv_digest(cv_text))
+    for attempt in range(GRADING_PARSE_RETRIES + 1):
+        if attempt > 0:
+            parse_stats.retry("intro_script")
+        with metrics.stage("llm_call:intro_script"):
+            response = await llm_client.chat_completion(
+                model="gpt-3.5-turbo",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=600,
+                response_format={"type": "json_object"}
+            )
+        prompt_budget.record("intro_script", messages, 600, response)
+        parse_stats.completion("intro_script")
+        try:
+            return parse_structured(response["choices"][0]["message"]["content"], INTRO_SCRIPT_SCHEMA)
+        except SchemaError as e:
+            parse_stats.failure("intro_script")
+            logger.warning(f"Could not parse introduction script: {str(e)}")
+    raise HTTPException(status_code=502, detail="Could not generate an introduction script. Please try again.")
+
+
+def build_validation_messages(question: str, transcription: str) -> List[dict]:
+    """
+    Build the chat messages that grade a single answer.
+    """
+    prompt = f"""
+        Question: {question}
         User's Answer: {transcription}
 
         Please evaluate the answer based on:
@@ -311,53 +732,307 @@ def validate_answer(transcription: str, question_data: dict) -> dict:
         2. Brief feedback
         3. Overall assessment (Correct/Partial/Incorrect)
 
-        Format your response exactly as:
-        Score: [number]/10
-        Feedback: [your feedback]
-        Assessment: [Correct/Partial/Incorrect]
+        {EVALUATION_JSON_FORMAT if STRUCTURED_OUTPUT else EVALUATION_TEXT_FORMAT}
         """
 
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert technical interviewer. Evaluate the candidate's answer."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=200
-        )
+    return [
+        {"role": "system", "content": "You are an expert technical interviewer. Evaluate the candidate's answer."},
+        {"role": "user", "content": prompt}
+    ]
 
-        # Parse the response
-        evaluation = response.choices[0].message.content
-        
-        # Extract score
-        score_line = [line for line in evaluation.split('\n') if line.startswith('Score:')][0]
-        score = int(score_line.split('/')[0].split(':')[1].strip())
-        
-        # Extract feedback
-        feedback_line = [line for line in evaluation.split('\n') if line.startswith('Feedback:')][0]
-        feedback = feedback_line.split(':', 1)[1].strip()
-        
-        # Extract assessment
-        assessment_line = [line for line in evaluation.split('\n') if line.startswith('Assessment:')][0]
-        result = assessment_line.split(':', 1)[1].strip()
+@tracer.traced()
+async def validate_answer(transcription: str, question_data: dict) -> dict:
+    """
+    Validate the user's answer, reusing the grading of an identical earlier answer.
+    """
+    if not transcription.strip():
+        return dict(NO_ANSWER_RESULT)
+    if PRESCORE_ENABLED:
+        prescored = pre_scorer.score(transcription, question_data)
+        if prescored is not None:
+            return prescored
+    return await grade_cache.get_or_grade(
+        question_data['question'], transcription,
+        lambda: grade_answer(transcription, question_data)
+    )
 
-        return {
-            "result": result,
-            "feedback": feedback,
-            "score": score
-        }
+@tracer.traced()
+async def grade_answer(transcription: str, question_data: dict) -> dict:
+    """
+    Grade the user's answer using OpenAI.
+    """
+    try:
+        # Truncate very long transcriptions so the prompt stays within its budget
+        messages = prompt_budget.fit(
+            "validate_answer",
+            lambda text: build_validation_messages(question_data['question'], text),
+            transcription
+        )
+        # An unparseable grading is retried instead of silently scoring 0
+        for attempt in range(GRADING_PARSE_RETRIES + 1):
+            if attempt:
+                parse_stats.retry("validate_answer")
+            with metrics.stage("llm_call:validate_answer"):
+                response = await llm_client.chat_completion(
+                    model="gpt-3.5-turbo",
+                    messages=messages,
+                    temperature=0.3,
+                    max_tokens=200,
+                    **({"response_format": {"type": "json_object"}} if STRUCTURED_OUTPUT else {})
+                )
+            prompt_budget.record("validate_answer", messages, 200, response)
+            parse_stats.completion("validate_answer")
+
+            # Parse the response
+            evaluation = response["choices"][0]["message"]["content"]
+            try:
+                with metrics.stage("evaluation_parse"):
+                    return parse_evaluation_response(evaluation)
+            except (SchemaError, IndexError, ValueError) as e:
+                parse_stats.failure("validate_answer")
+                logger.warning(f"Could not parse evaluation (attempt {attempt + 1}): {str(e)}")
+        raise Exception(f"Evaluation could not be parsed after {GRADING_PARSE_RETRIES + 1} attempts")
     except Exception as e:
-        logger.error(f"Error in validate_answer: {str(e)}")
+        logger.error(f"Error in grade_answer: {str(e)}")
         return {
             "result": "Error",
             "feedback": "Failed to evaluate answer",
             "score": 0
         }
 
+@tracer.traced()
+async def evaluate_answer_chunk(items: List[dict]) -> List[dict]:
+    """
+    Grade several question/transcription pairs with a single LLM call.
+
+    Any answer whose block cannot be parsed is re-graded individually.
+    """
+    answers = "\n\n".join(
+        f"Answer {i}:\nQuestion: {item['question']}\n"
+        f"User's Answer: {prompt_budget.truncate(item['transcription'], ANSWER_MAX_TOKENS)}"
+        for i, item in enumerate(items, 1)
+    )
+    prompt = f"""
+    Evaluate each of the following {len(items)} answers independently based on:
+    1. Technical accuracy
+    2. Completeness
+    3. Clarity of explanation
+
+    {answers}
+
+    {BATCH_EVALUATION_JSON_FORMAT if STRUCTURED_OUTPUT else BATCH_EVALUATION_TEXT_FORMAT}
+    """
+
+    messages = [
+        {"role": "system", "content": "You are an expert technical interviewer. Evaluate the candidate's answers."},
+        {"role": "user", "content": prompt}
+    ]
+    max_tokens = 150 * len(items) + 50
+
+    parsed = {}
+    completed = False
+    try:
+        with metrics.stage("llm_call:evaluate_batch"):
+            response = await llm_client.chat_completion(
+                model="gpt-3.5-turbo",
+                messages=messages,
+                temperature=0.3,
+                max_tokens=max_tokens,
+                **({"response_format": {"type": "json_object"}} if STRUCTURED_OUTPUT else {})
+            )
+        prompt_budget.record("evaluate_batch", messages, max_tokens, response)
+        parse_stats.completion("evaluate_batch")
+        completed = True
+        evaluation = response["choices"][0]["message"]["content"]
+        with metrics.stage("evaluation_parse"):
+            parsed = parse_batch_evaluation(evaluation)
+    except Exception as e:
+        logger.error(f"Error in evaluate_answer_chunk: {str(e)}")
+
+    missing = [i for i in range(1, len(items) + 1) if i not in parsed]
+    if completed and missing:
+        parse_stats.failure("evaluate_batch")
+
+    results = []
+    for i, item in enumerate(items, 1):
+        if i in parsed:
+            results.append(parsed[i])
+            continue
+        logger.warning(f"Batch evaluation missing answer {i}, grading it individually")
+        if completed:
+            parse_stats.retry("evaluate_batch")
+        results.append(await grade_answer(item['transcription'], {"question": item['question']}))
+    return results
+
+@tracer.traced()
+async def evaluate_answers_batch(items: List[dict]) -> List[dict]:
+    """
+    Grade many question/transcription pairs, EVALUATION_BATCH_SIZE per LLM call.
+
+    Empty, pre-scored and already cached answers are not sent to the LLM.
+    """
+    results: List[Optional[dict]] = []
+    pending = []
+    for index, item in enumerate(items):
+        if not item['transcription'].strip():
+            results.append(dict(NO_ANSWER_RESULT))
+            continue
+        prescored = pre_scorer.score(item['transcription'], item) if PRESCORE_ENABLED else None
+        if prescored is not None:
+            results.append(prescored)
+            continue
+        results.append(grade_cache.get(item['question'], item['transcription']))
+        if results[-1] is None:
+            pending.append(index)
+
+    chunks = [pending[i:i + EVALUATION_BATCH_SIZE] for i in range(0, len(pending), EVALUATION_BATCH_SIZE)]
+    graded = await asyncio.gather(*(evaluate_answer_chunk([items[i] for i in chunk]) for chunk in chunks))
+    for chunk, chunk_results in zip(chunks, graded):
+        for index, result in zip(chunk, chunk_results):
+            grade_cache.put(items[index]['question'], items[index]['transcription'], result)
+            results[index] = result
+    return results
+
+async def rewind_audio_upload(file: UploadFile) -> BinaryIO:
+    """
+    Return the upload's own spool, rewound, so the answer is passed on without another copy.
+
+    Starlette has already spooled the multipart part while parsing the form: in memory
+    up to 1 MB, in a temporary file above that. The spool is closed when the request ends.
+    """
+    await file.seek(0)
+    return file.file
+
+def spool_audio_to_disk(source: BinaryIO) -> BinaryIO:
+    """
+    Copy an answer into its own temporary file so it outlives the request (for queued jobs).
+    Blocking: run it off the event loop.
+    """
+    copy = tempfile.TemporaryFile()
+    shutil.copyfileobj(source, copy, AUDIO_COPY_CHUNK)
+    copy.seek(0)
+    return copy
+
+@tracer.traced()
+async def transcribe_audio(audio, filename: str = "answer.webm") -> str:
+    """
+    Transcribe an answer (bytes or a binary file object) with the configured backend.
+    The buffer is passed straight through, never written to uploads/.
+
+    Silent recordings are detected locally and return an empty transcription
+    without calling the backend.
+    """
+    if AUDIO_PREPROCESS:
+        with metrics.stage("audio_preprocess"):
+            processed = await asyncio.to_thread(preprocess_audio, audio, filename)
+        if processed is None:
+            # Undecodable: send the original recording, rewound after the decode attempt
+            if not isinstance(audio, bytes):
+                audio.seek(0)
+        elif processed.is_silent:
+            logger.info(f"No speech detected in {filename} ({processed.duration_ms} ms), skipping transcription")
+            return ""
+        else:
+            audio, filename = processed.data, processed.filename
+
+    logger.info(f"Starting transcription with {transcriber.name} backend")
+    with metrics.stage("transcription"):
+        transcription = await transcriber.transcribe(
+            audio,
+            filename=filename,
+            language="en"
+        )
+    logger.info(f"Transcription result: {transcription}")
+    return transcription
+
+async def score_audio_job(payload: dict) -> dict:
+    """
+    Background handler: transcribe and grade one queued answer, then update the session.
+    """
+    session_id = payload["session_id"]
+    question_number = payload["question_number"]
+    with payload["audio"] as audio:
+        transcription = await transcribe_audio(audio, payload["filename"])
+
+    session = await get_session(session_id)
+    if session is None:
+        raise Exception(f"Session {session_id} expired before the answer was scored")
+
+    current_question = session["questions"][question_number - 1]
+    validation = await validate_answer(transcription, current_question)
+    total_score = await record_answer(session_id, question_number, transcription, validation)
+
+    return AudioResponse(
+        status="success",
+        transcription=transcription,
+        validation_result=validation["result"],
+        feedback=validation["feedback"],
+        score=validation["score"],
+        total_score=total_score
+    ).dict()
+
+async def get_session(session_id: str) -> Optional[dict]:
+    """
+    Load an interview session from the store (None if it does not exist).
+    """
+    with metrics.stage("session_lookup"):
+        return await interview_sessions.get(session_id)
+
+async def transcribe_segment(audio, filename: str) -> str:
+    """
+    Transcribe one segment of a streamed answer.
+    """
+    with metrics.stage("transcription_stream"):
+        return await transcriber.transcribe(audio, filename=filename, language="en")
+
+def new_session(request: InterviewRequest, questions: List[dict]) -> dict:
+    """
+    Build the initial state for an interview session.
+    """
+    return {
+        "questions": questions,
+        "current": 0,
+        "start_time": datetime.now().isoformat(),
+        "designation": request.designation,
+        "experience": request.experience,
+        "answers": {},
+        "total_score": 0,
+        "questions_answered": 0
+    }
+
+@tracer.traced()
+async def record_answer(session_id: str, question_number: int, transcription: str, validation: dict = None) -> int:
+    """
+    Store an answer on the session and atomically update its counters.
+    Returns the session's new total score.
+
+    Without a validation result the answer is kept as pending for a later score-all.
+    Raises a 404 if the session expired or was evicted while the answer was processed.
+    """
+    try:
+        await interview_sessions.set_item(session_id, "answers", str(question_number), {
+            "transcription": transcription,
+            "result": validation["result"] if validation else "Pending",
+            "feedback": validation["feedback"] if validation else "",
+            "score": validation["score"] if validation else 0,
+            "pending": validation is None
+        })
+
+        # Update questions answered count and session score
+        await interview_sessions.incr(session_id, "questions_answered", 1)
+        return await interview_sessions.incr(session_id, "total_score", validation["score"] if validation else 0)
+    except SessionNotFound:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+def sse_event(event: str, data: dict) -> str:
+    """
+    Format a server-sent event frame.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 # ------------------ Endpoints ------------------
 
-@app.post("/interview/start")
+@router.post("/interview/start")
 async def start_interview(request: InterviewRequest):
     """
     Start a new interview session with generated questions.
@@ -365,10 +1040,16 @@ async def start_interview(request: InterviewRequest):
     try:
         logger.info(f"Starting interview for {request.designation} with {request.experience} experience")
         
-        # Generate questions using OpenAI
+        # Serve a cached question set when one exists, otherwise generate using OpenAI
         try:
-            questions = generate_interview_questions(request.designation, request.experience, request.difficulty)
-            logger.info(f"Successfully generated {len(questions)} questions")
+            questions = question_cache.get(request.designation, request.experience, request.difficulty)
+            if questions is not None:
+                logger.info(f"Serving {len(questions)} cached questions")
+            else:
+                questions = await generate_interview_questions(request.designation, request.experience, request.difficulty)
+                logger.info(f"Successfully generated {len(questions)} questions")
+                if len(questions) == 20:
+                    question_cache.put(request.designation, request.experience, request.difficulty, questions)
         except Exception as e:
             logger.error(f"Error generating questions: {str(e)}. Please check the OpenAI API key and the request format.")
             raise HTTPException(
@@ -386,16 +1067,7 @@ async def start_interview(request: InterviewRequest):
         
         # Create new session
         session_id = str(uuid.uuid4())
-        interview_sessions[session_id] = {
-            "questions": questions,
-            "current": 0,
-            "start_time": datetime.now(),
-            "designation": request.designation,
-            "experience": request.experience,
-            "answers": {},
-            "total_score": 0,
-            "questions_answered": 0
-        }
+        await interview_sessions.set(session_id, new_session(request, questions))
         
         # Format response
         response_data = {
@@ -416,15 +1088,193 @@ async def start_interview(request: InterviewRequest):
             detail=f"Failed to start interview session: {str(e)}"
         )
 
-@app.get("/interview/{session_id}/next")
+@router.post("/interview/start/stream")
+async def start_interview_stream(request: InterviewRequest):
+    """
+    Start a new interview session and stream each question over SSE as soon as it is generated.
+
+    Events: `session` (session id), one `question` per Q&A pair, then `complete` or `error`.
+    If the upstream stream fails part-way the remaining questions are generated with a
+    regular call; if that fails too the session is deleted and `error` is sent.
+    """
+    logger.info(f"Starting streamed interview for {request.designation} with {request.experience} experience")
+    session_id = str(uuid.uuid4())
+    session = new_session(request, [])
+
+    async def question_event(question: dict) -> str:
+        # Publish each question to the shared store as soon as it is parsed
+        session["questions"].append(question)
+        await interview_sessions.update(session_id, {"questions": session["questions"]})
+        return sse_event("question", {
+            "question_number": len(session["questions"]),
+            **question
+        })
+
+    async def event_stream():
+        await interview_sessions.set(session_id, session)
+        yield sse_event("session", {"session_id": session_id, "total_questions": 20})
+        complete = False
+        try:
+            cached = question_cache.get(request.designation, request.experience, request.difficulty)
+            if cached is not None:
+                logger.info(f"Streaming {len(cached)} cached questions")
+                for question in cached:
+                    yield await question_event(question)
+            else:
+                parser = QuestionStreamParser()
+                # Streaming keeps the line format so each question can be parsed as it arrives
+                messages = fit_question_messages(request.designation, request.experience, request.difficulty,
+                                                 structured=False)
+                # Streamed completions carry no usage block, so only the prompt is counted
+                prompt_budget.record("questions", messages, 2000)
+                try:
+                    # Covers the whole stream, including time spent publishing questions
+                    with metrics.stage("llm_call:questions_stream"):
+                        async for delta in llm_client.stream_chat_completion(
+                            model="gpt-3.5-turbo",
+                            messages=messages,
+                            temperature=0.7,
+                            max_tokens=2000
+                        ):
+                            for question in parser.feed(delta):
+                                if len(session["questions"]) < 20:
+                                    yield await question_event(question)
+                    for question in parser.close():
+                        if len(session["questions"]) < 20:
+                            yield await question_event(question)
+                except Exception as e:
+                    # Keep the questions already published; the top-up below generates the rest
+                    logger.warning(f"Question stream for {session_id} failed after "
+                                   f"{len(session['questions'])} questions: {str(e)}")
+
+                # Top up a short or interrupted stream with only the missing questions
+                if len(session["questions"]) < 20:
+                    streamed = list(session["questions"])
+                    questions = await generate_interview_questions(
+                        request.designation, request.experience, request.difficulty, existing=streamed
+                    )
+                    for question in questions[len(streamed):]:
+                        yield await question_event(question)
+                question_cache.put(request.designation, request.experience, request.difficulty, session["questions"])
+
+            logger.info(f"Successfully streamed interview session {session_id}")
+            complete = True
+            yield sse_event("complete", {
+                "session_id": session_id,
+                "total_questions": len(session["questions"])
+            })
+        except Exception as e:
+            logger.error(f"Error streaming interview {session_id}: {str(e)}")
+            yield sse_event("error", {"detail": f"Failed to start interview session: {str(e)}"})
+        finally:
+            # Never leave a session with a partial question set behind (failed top-up
+            # or a client that disconnected mid-stream)
+            if not complete:
+                await interview_sessions.delete(session_id)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/interview/cache/stats")
+async def get_question_cache_stats():
+    """
+    Return hit/miss counters and occupancy of the question-set cache.
+    """
+    return question_cache.stats()
+
+@router.get("/admin/traces/slow")
+async def get_slow_traces(limit: int = 10):
+    """
+    Return the slowest recent requests with their span trees (and stack profiles when sampled).
+    """
+    return {
+        **tracer.stats(),
+        "slowest": tracer.slowest(limit)
+    }
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Per-stage latency histograms, counters and in-flight gauges in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@router.get("/interview/metrics/stages")
+async def get_stage_metrics():
+    """
+    Per-stage count, errors, in-flight, mean and bucketed p50/p95/p99 latency as JSON.
+    """
+    return metrics.summary()
+
+@router.get("/interview/grading/cache/stats")
+async def get_grade_cache_stats():
+    """
+    Return hit/miss counters and occupancy of the answer grading cache.
+    """
+    return grade_cache.stats()
+
+@router.get("/interview/grading/prescore/stats")
+async def get_prescore_stats():
+    """
+    Return how many answers the local pre-scorer graded and how many LLM calls it saved.
+    """
+    return {"enabled": PRESCORE_ENABLED, **pre_scorer.stats()}
+
+@router.get("/interview/parse/stats")
+async def get_parse_stats():
+    """
+    Return completions, parse failures and the extra round trips (retries) they caused per call site.
+    Compare a STRUCTURED_OUTPUT=0 run with a STRUCTURED_OUTPUT=1 run to measure the change.
+    """
+    return parse_stats.stats()
+
+@router.get("/interview/prompts/stats")
+async def get_prompt_token_stats():
+    """
+    Return per-call-site prompt/completion token counts, truncations and suggested max_tokens.
+    """
+    return prompt_budget.stats()
+
+@router.get("/cv/stats")
+async def get_cv_extraction_stats():
+    """
+    Return CV text cache counters and per-document extraction timings.
+    """
+    return cv_texts.stats()
+
+@router.on_event("shutdown")
+async def stop_cv_extraction():
+    cv_texts.engine.shutdown()
+
+@router.get("/interview/sessions/stats")
+async def get_session_store_stats():
+    """
+    Return entry counts and estimated memory of the session and CV stores.
+    """
+    return {
+        "interview_sessions": await interview_sessions.stats(),
+        "uploaded_cvs": await uploaded_cvs.stats()
+    }
+
+@router.get("/interview/generation/stats")
+async def get_question_generation_stats():
+    """
+    Return question-generation call and retry counters.
+    """
+    return question_generation_stats
+
+@router.get("/interview/{session_id}/next")
 async def get_next_question(session_id: str):
     """
     Get the next question or end the interview.
     """
-    if session_id not in interview_sessions:
+    session = await get_session(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Interview session not found")
     
-    session = interview_sessions[session_id]
     next_index = session["current"] + 1
     
     if next_index >= len(session["questions"]):
@@ -443,7 +1293,10 @@ async def get_next_question(session_id: str):
             }
         }
     
-    session["current"] = next_index
+    try:
+        await interview_sessions.update(session_id, {"current": next_index})
+    except SessionNotFound:
+        raise HTTPException(status_code=404, detail="Interview session not found")
     return {
         "is_complete": False,
         "question": session["questions"][next_index]["question"],
@@ -451,73 +1304,60 @@ async def get_next_question(session_id: str):
         "total_questions": len(session["questions"])
     }
 
-@app.post("/interview/audio/upload", response_model=AudioResponse)
+@router.post("/interview/audio/upload", response_model=AudioResponse)
 async def upload_audio(
     file: UploadFile = File(...),
     session_id: str = Form(...),
-    question_number: int = Form(...)
+    question_number: int = Form(...),
+    defer_scoring: bool = Form(False)
 ):
     """
     Process audio answer and validate it against the expected answer.
+
+    With `defer_scoring` the answer is only transcribed and stored; grade it later
+    with /interview/{session_id}/score_all.
     """
     try:
         logger.info(f"Received audio upload - Session: {session_id}, Question: {question_number}")
         
-        if session_id not in interview_sessions:
+        session = await get_session(session_id)
+        if session is None:
             raise HTTPException(status_code=404, detail="Session not found")
 
-        session = interview_sessions[session_id]
-        if question_number > len(session["questions"]):
+        if question_number < 1 or question_number > len(session["questions"]):
             raise HTTPException(status_code=400, detail="Invalid question number")
 
-        # Read the audio file
-        audio_content = await file.read()
-        
-        # Save temporarily
-        temp_path = f"{UPLOAD_DIR}/{uuid.uuid4()}.webm"
-        with open(temp_path, "wb") as f:
-            f.write(audio_content)
-
-        try:
-            # Transcribe using OpenAI Whisper API
-            with open(temp_path, "rb") as audio_file:
-                logger.info("Starting transcription with Whisper API")
-                transcript = openai.Audio.transcribe(
-                    "whisper-1",
-                    audio_file,
-                    language="en"
-                )
-                transcription = transcript.text
-                logger.info(f"Transcription result: {transcription}")
-
-            # Get current question and validate answer
-            current_question = session["questions"][question_number - 1]
-            validation = validate_answer(transcription, current_question)
-            
-            # Update session score
-            if "total_score" not in session:
-                session["total_score"] = 0
-            session["total_score"] += validation["score"]
-            
-            # Update questions answered count
-            if "questions_answered" not in session:
-                session["questions_answered"] = 0
-            session["questions_answered"] += 1
+        # Transcribe from the upload's own spool; FastAPI closes it after the response
+        audio = await rewind_audio_upload(file)
+        transcription = await transcribe_audio(audio, file.filename or "answer.webm")
 
+        if defer_scoring:
+            total_score = await record_answer(session_id, question_number, transcription)
             return AudioResponse(
-                status="success",
+                status="pending",
                 transcription=transcription,
-                validation_result=validation["result"],
-                feedback=validation["feedback"],
-                score=validation["score"],
-                total_score=session["total_score"]
+                validation_result="Pending",
+                feedback="",
+                score=0,
+                total_score=total_score
             )
 
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+        # Get current question and validate answer
+        current_question = session["questions"][question_number - 1]
+        validation = await validate_answer(transcription, current_question)
+        total_score = await record_answer(session_id, question_number, transcription, validation)
+
+        return AudioResponse(
+            status="success",
+            transcription=transcription,
+            validation_result=validation["result"],
+            feedback=validation["feedback"],
+            score=validation["score"],
+            total_score=total_score
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing audio: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -525,6 +1365,270 @@ async def upload_audio(
             detail=str(e)
         )
 
+@router.post("/interview/audio/upload_async", status_code=202)
+async def upload_audio_async(
+    file: UploadFile = File(...),
+    session_id: str = Form(...),
+    question_number: int = Form(...),
+    callback_url: Optional[str] = Form(None)
+):
+    """
+    Accept an audio answer immediately and score it in the background.
+
+    Poll /interview/jobs/{job_id} for the result, or pass `callback_url` to have the
+    finished job POSTed to you (only to origins listed in SCORING_CALLBACK_ORIGINS).
+    """
+    logger.info(f"Received async audio upload - Session: {session_id}, Question: {question_number}")
+
+    session = await get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    if question_number < 1 or question_number > len(session["questions"]):
+        raise HTTPException(status_code=400, detail="Invalid question number")
+
+    if callback_url:
+        try:
+            scoring_jobs.check_callback_url(callback_url)
+        except CallbackNotAllowed as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    # The upload's spool is closed when this request ends, and queued jobs can wait a
+    # while, so each job gets its own copy on disk rather than in memory
+    with metrics.stage("upload_read"):
+        audio = await asyncio.to_thread(spool_audio_to_disk, await rewind_audio_upload(file))
+    try:
+        job = scoring_jobs.submit(
+            {
+                "session_id": session_id,
+                "question_number": question_number,
+                "audio": audio,
+                "filename": file.filename or "answer.webm"
+            },
+            callback_url=callback_url
+        )
+    except JobQueueFull as e:
+        audio.close()
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "status_url": f"/interview/jobs/{job['job_id']}"
+    }
+
+@router.get("/interview/jobs/stats")
+async def get_scoring_job_stats():
+    """
+    Return scoring worker and queue statistics.
+    """
+    return scoring_jobs.stats()
+
+@router.get("/interview/jobs/{job_id}")
+async def get_scoring_job(job_id: str, wait: float = 0):
+    """
+    Return a scoring job's status and result, optionally long-polling up to `wait` seconds.
+    """
+    job = await scoring_jobs.wait(job_id, min(wait, 30))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return ScoringJobQueue.public(job)
+
+@router.websocket("/interview/{session_id}/audio/ws")
+async def stream_audio(websocket: WebSocket, session_id: str):
+    """
+    Stream an answer while the candidate speaks and transcribe it incrementally.
+
+    Protocol (one connection can cover several questions):
+      client -> {"type": "start", "question_number": n}, then binary audio chunks,
+                then {"type": "stop"}
+      server -> {"type": "ready"}, {"type": "partial", "text": ...} while speaking,
+                {"type": "result", ...AudioResponse fields} after stop,
+                {"type": "error", "detail": ...} on failure
+    """
+    await websocket.accept()
+    session = await get_session(session_id)
+    if session is None:
+        await websocket.send_json({"type": "error", "detail": "Session not found"})
+        await websocket.close(code=4404)
+        return
+
+    stream = None
+    question_number = None
+
+    async def send_partial(text: str):
+        await websocket.send_json({"type": "partial", "text": text})
+
+    async def finish_answer(answer: IncrementalTranscriber, number: int):
+        try:
+            transcription = await answer.finalize()
+            logger.info(f"Streamed transcription result: {transcription}")
+            current_question = session["questions"][number - 1]
+            validation = await validate_answer(transcription, current_question)
+            total_score = await record_answer(session_id, number, transcription, validation)
+            await websocket.send_json({
+                "type": "result",
+                **AudioResponse(
+                    status="success",
+                    transcription=transcription,
+                    validation_result=validation["result"],
+                    feedback=validation["feedback"],
+                    score=validation["score"],
+                    total_score=total_score
+                ).dict()
+            })
+        except Exception as e:
+            logger.error(f"Error finalizing streamed answer: {str(e)}", exc_info=True)
+            await websocket.send_json({"type": "error", "detail": str(e)})
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("bytes") is not None:
+                if stream is None:
+                    await websocket.send_json({"type": "error", "detail": "Send a start message before audio"})
+                    continue
+                try:
+                    stream.feed(message["bytes"])
+                except RecordingTooLarge as e:
+                    # Score what was received so far; further chunks need a new start
+                    await websocket.send_json({"type": "error", "detail": f"{str(e)}; answer stopped"})
+                    answer, stream = stream, None
+                    await finish_answer(answer, question_number)
+                continue
+
+            try:
+                data = json.loads(message.get("text") or "{}")
+            except ValueError:
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON objects"})
+                continue
+            if not isinstance(data, dict):
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON objects"})
+                continue
+
+            if data.get("type") == "start":
+                try:
+                    number = int(data.get("question_number", 0))
+                except (TypeError, ValueError):
+                    await websocket.send_json({"type": "error", "detail": "question_number must be an integer"})
+                    continue
+                # Re-read so questions still arriving from a streamed start are visible
+                session = await get_session(session_id) or session
+                if number < 1 or number > len(session["questions"]):
+                    await websocket.send_json({"type": "error", "detail": "Invalid question number"})
+                    continue
+                if stream is not None:
+                    logger.info(f"Discarding unfinished streamed answer to question {question_number}")
+                    stream.cancel()
+                question_number = number
+                logger.info(f"Streaming audio - Session: {session_id}, Question: {question_number}")
+                stream = IncrementalTranscriber(
+                    transcribe=transcribe_segment,
+                    filename=str(data.get("filename") or "answer.webm"),
+                    on_partial=send_partial
+                )
+                await websocket.send_json({"type": "ready", "question_number": question_number})
+
+            elif data.get("type") == "stop":
+                if stream is None:
+                    await websocket.send_json({"type": "error", "detail": "No answer in progress"})
+                    continue
+                answer, stream = stream, None
+                await finish_answer(answer, question_number)
+
+    except WebSocketDisconnect:
+        logger.info(f"Audio stream closed - Session: {session_id}")
+    finally:
+        if stream is not None:
+            stream.cancel()
+
+@router.post("/interview/evaluate/batch")
+async def evaluate_batch(request: BatchEvaluationRequest):
+    """
+    Grade many question/answer pairs at once (up to EVALUATION_MAX_ANSWERS), packing
+    several into each LLM call.
+    """
+    if not request.answers:
+        raise HTTPException(status_code=400, detail="No answers provided")
+    if len(request.answers) > EVALUATION_MAX_ANSWERS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many answers: at most {EVALUATION_MAX_ANSWERS} can be evaluated per request"
+        )
+
+    items = [answer.dict() for answer in request.answers]
+    results = await evaluate_answers_batch(items)
+    return {
+        "results": [
+            {"question": item["question"], **result}
+            for item, result in zip(items, results)
+        ],
+        "total_score": sum(result["score"] for result in results)
+    }
+
+@router.post("/interview/{session_id}/score_all")
+async def score_all_answers(session_id: str):
+    """
+    Grade every pending answer stored on a session in batched LLM calls.
+    """
+    # Only one score-all per session at a time, so concurrent calls or a client retrying
+    # after a proxy timeout cannot grade the same answers twice and add both to total_score
+    try:
+        acquired = await interview_sessions.acquire_lease(session_id, "scoring_until", SCORE_ALL_LEASE_SECONDS)
+    except SessionNotFound:
+        raise HTTPException(status_code=404, detail="Interview session not found")
+    if not acquired:
+        raise HTTPException(status_code=409, detail="Answers for this session are already being scored")
+    try:
+        # Read under the lease so answers scored by an earlier call are no longer pending
+        session = await get_session(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Interview session not found")
+        return await score_pending_answers(session_id, session)
+    finally:
+        await interview_sessions.release_lease(session_id, "scoring_until")
+
+async def score_pending_answers(session_id: str, session: dict) -> dict:
+    """
+    Grade the session's pending answers and store the results (caller holds the scoring lease).
+    """
+    pending = [
+        (number, answer) for number, answer in session["answers"].items()
+        if answer["pending"]
+    ]
+    if pending:
+        logger.info(f"Scoring {len(pending)} pending answers for session {session_id}")
+        items = [
+            {
+                "question": session["questions"][int(number) - 1]["question"],
+                "model_answer": session["questions"][int(number) - 1].get("model_answer"),
+                "transcription": answer["transcription"]
+            }
+            for number, answer in pending
+        ]
+        results = await evaluate_answers_batch(items)
+        try:
+            for (number, answer), result in zip(pending, results):
+                answer.update(result)
+                answer["pending"] = False
+                await interview_sessions.set_item(session_id, "answers", number, answer)
+                session["total_score"] = await interview_sessions.incr(session_id, "total_score", result["score"])
+        except SessionNotFound:
+            raise HTTPException(status_code=404, detail="Interview session not found")
+
+    return {
+        "session_id": session_id,
+        "scored": len(pending),
+        "answers": session["answers"],
+        "total_score": session["total_score"],
+        "questions_answered": session["questions_answered"]
+    }
+
+app.include_router(router)
+
 # ------------------ Run the App ------------------
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+import bisect
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, Optional, Tuple
+
+# Histogram bucket upper bounds in seconds, from a session lookup to a slow Whisper call
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class StageHistogram:
+    """
+    Cumulative latency histogram for one stage (Prometheus semantics).
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            yield f"{bound:g}", running
+        yield "+Inf", running + self.counts[-1]
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Upper bucket bound below which a fraction `q` of observations fall
+        (None when it lies beyond the last bucket).
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        for bound, running in self.cumulative():
+            if running >= target:
+                return float(bound) if bound != "+Inf" else None
+        return None
+
+
+class StageMetrics:
+    """
+    Per-stage latency histograms, outcome counters and in-flight gauges.
+
+    Wrap each unit of work in `with metrics.stage("transcription"):`. The registry is
+    rendered in the Prometheus text format for scraping, or summarised as JSON. With a
+    `tracer`, every stage is also recorded as a span of the current request's trace.
+    """
+
+    def __init__(self, prefix: str = "hired", buckets=DEFAULT_BUCKETS, tracer=None):
+        self.prefix = prefix
+        self.buckets = buckets
+        self.tracer = tracer
+        self._histograms: Dict[str, StageHistogram] = {}
+        self._outcomes: Dict[Tuple[str, str], int] = {}
+        self._in_flight: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        if name not in self._histograms:
+            self._histograms[name] = StageHistogram(self.buckets)
+            self._in_flight[name] = 0
+        self._in_flight[name] += 1
+        outcome = "error"
+        start = time.perf_counter()
+        try:
+            with self.tracer.span(name) if self.tracer else nullcontext():
+                yield
+            outcome = "ok"
+        finally:
+            self._histograms[name].observe(time.perf_counter() - start)
+            self._in_flight[name] -= 1
+            self._outcomes[(name, outcome)] = self._outcomes.get((name, outcome), 0) + 1
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition of every stage.
+        """
+        duration = f"{self.prefix}_stage_duration_seconds"
+        total = f"{self.prefix}_stage_total"
+        in_flight = f"{self.prefix}_stage_in_flight"
+        lines = [
+            f"# HELP {duration} Time spent in each request-handling stage.",
+            f"# TYPE {duration} histogram",
+        ]
+        for name, histogram in sorted(self._histograms.items()):
+            for bound, count in histogram.cumulative():
+                lines.append(f'{duration}_bucket{{stage="{name}",le="{bound}"}} {count}')
+            lines.append(f'{duration}_sum{{stage="{name}"}} {histogram.sum:.6f}')
+            lines.append(f'{duration}_count{{stage="{name}"}} {histogram.count}')
+        lines += [f"# HELP {total} Completed stage executions by outcome.", f"# TYPE {total} counter"]
+        for (name, outcome), count in sorted(self._outcomes.items()):
+            lines.append(f'{total}{{stage="{name}",outcome="{outcome}"}} {count}')
+        lines += [f"# HELP {in_flight} Stage executions currently running.", f"# TYPE {in_flight} gauge"]
+        for name, count in sorted(self._in_flight.items()):
+            lines.append(f'{in_flight}{{stage="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict:
+        return {
+            name: {
+                "count": histogram.count,
+                "errors": self._outcomes.get((name, "error"), 0),
+                "in_flight": self._in_flight[name],
+                "mean_seconds": round(histogram.sum / histogram.count, 4) if histogram.count else 0.0,
+                "p50_seconds_le": histogram.quantile(0.5),
+                "p95_seconds_le": histogram.quantile(0.95),
+                "p99_seconds_le": histogram.quantile(0.99),
+            }
+            for name, histogram in sorted(self._histograms.items())
+        }
@@ -0,0 +1,263 @@
+"""
+Local stand-in for the OpenAI chat-completion and audio-transcription endpoints.
+
+Replies are canned but shaped like the real API (including streaming and usage
+blocks) and follow the formats main.py parses, so the interview service can be
+load-tested without spending API credit. Latency and failures are injectable.
+
+Transcriptions are varied per request so the grade cache does not answer every
+upload; raise transcript_repeat_rate (or MOCK_TRANSCRIPT_REPEAT_RATE) to model
+repeated answers.
+
+Usage:
+    python mock_openai.py --port 8100 --latency-ms 800 --jitter-ms 300 --failure-rate 0.02
+    OPENAI_API_BASE=http://127.0.0.1:8100/v1 uvicorn main:app --port 8000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+import uuid
+
+from fastapi import FastAPI, File, Form, Request, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# ------------------ Configuration ------------------
+
+MOCK_LATENCY_MS = float(os.getenv("MOCK_LATENCY_MS", "500"))
+MOCK_JITTER_MS = float(os.getenv("MOCK_JITTER_MS", "200"))
+MOCK_TRANSCRIBE_LATENCY_MS = float(os.getenv("MOCK_TRANSCRIBE_LATENCY_MS", "1500"))
+MOCK_STREAM_CHUNK_MS = float(os.getenv("MOCK_STREAM_CHUNK_MS", "20"))
+MOCK_FAILURE_RATE = float(os.getenv("MOCK_FAILURE_RATE", "0"))
+# Fraction of injected failures that are 429 rate limits rather than 500s
+MOCK_RATE_LIMIT_SHARE = float(os.getenv("MOCK_RATE_LIMIT_SHARE", "0.5"))
+# Fraction of replies with formatting drift (markdown labels / "Question n:" in text
+# mode, off-schema values in JSON mode) to exercise the parsers' retry paths
+MOCK_FORMAT_DRIFT_RATE = float(os.getenv("MOCK_FORMAT_DRIFT_RATE", "0"))
+MOCK_JSON_DRIFT_RATE = float(os.getenv("MOCK_JSON_DRIFT_RATE", "0"))
+# Fraction of transcriptions that return the same fixed answer; the rest are built at
+# random so the grade cache and pre-scorer see realistic, mostly unique answers
+MOCK_TRANSCRIPT_REPEAT_RATE = float(os.getenv("MOCK_TRANSCRIPT_REPEAT_RATE", "0"))
+
+app = FastAPI(title="Mock OpenAI API")
+
+config = {
+    "latency_ms": MOCK_LATENCY_MS,
+    "jitter_ms": MOCK_JITTER_MS,
+    "transcribe_latency_ms": MOCK_TRANSCRIBE_LATENCY_MS,
+    "stream_chunk_ms": MOCK_STREAM_CHUNK_MS,
+    "failure_rate": MOCK_FAILURE_RATE,
+    "rate_limit_share": MOCK_RATE_LIMIT_SHARE,
+    "format_drift_rate": MOCK_FORMAT_DRIFT_RATE,
+    "json_drift_rate": MOCK_JSON_DRIFT_RATE,
+    "transcript_repeat_rate": MOCK_TRANSCRIPT_REPEAT_RATE
+}
+counters = {"chat": 0, "chat_stream": 0, "transcriptions": 0, "failures": 0}
+
+SAMPLE_ANSWER = ("I would start by reproducing the issue, check the logs and metrics, "
+                 "isolate the failing component, apply a fix behind a feature flag and monitor it.")
+ANSWER_STEPS = [
+    "reproduce the issue in a staging environment", "read the application logs around the failure",
+    "compare latency and error metrics before and after the last deploy", "check recent configuration changes",
+    "write a failing test that captures the bug", "isolate the component that misbehaves",
+    "roll back the release if customers are affected", "add tracing to the slow request path",
+    "profile the hot loop and remove redundant work", "put the fix behind a feature flag",
+    "review the change with a teammate", "monitor the dashboards after rollout",
+    "write a short postmortem for the team", "add an alert so it is caught earlier next time",
+]
+ANSWER_OPENERS = ["First I would", "I would start to", "My approach is to", "Usually I", "In my last role I would"]
+
+
+def transcript_reply() -> str:
+    """
+    Text for one transcription: the fixed sample answer at `transcript_repeat_rate`,
+    otherwise a random selection of steps so answers rarely repeat.
+    """
+    if random.random() < config["transcript_repeat_rate"]:
+        return SAMPLE_ANSWER
+    steps = random.sample(ANSWER_STEPS, random.randint(3, 6))
+    return f"{random.choice(ANSWER_OPENERS)} {', then '.join(steps)}."
+
+
+async def simulate_latency(base_ms: float):
+    delay = max(0.0, random.gauss(base_ms, config["jitter_ms"])) / 1000
+    await asyncio.sleep(delay)
+
+
+def injected_failure():
+    """
+    Return an error response for a randomly failed call, or None.
+    """
+    if random.random() >= config["failure_rate"]:
+        return None
+    counters["failures"] += 1
+    if random.random() < config["rate_limit_share"]:
+        return JSONResponse(status_code=429, content={"error": {"message": "Rate limit reached (mock)", "type": "requests"}})
+    return JSONResponse(status_code=500, content={"error": {"message": "Internal server error (mock)", "type": "server_error"}})
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def json_reply_for(prompt: str) -> str:
+    """
+    Build a JSON completion for a response_format=json_object request.
+    """
+    drift = random.random() < config["json_drift_rate"]
+    match = re.search(r"Generate exactly (\d+) unique", prompt)
+    if match:
+        return json.dumps({"questions": [
+            {"question": f"Mock question {uuid.uuid4().hex[:8]} about handling scenario {i}?",
+             "answer": "1) Reproduce the issue 2) Check logs and metrics 3) Isolate the component 4) Fix and monitor"}
+            for i in range(1, int(match.group(1)) + 1)
+        ]})
+
+    if '"personalized_intro"' in prompt:
+        return json.dumps({
+            "personalized_intro": "I am a software engineer with five years of experience building and operating "
+                                  "backend services, most recently leading the migration of a payments platform.",
+            "overall_feedback": "Mock feedback."
+        })
+
+    def evaluation(**extra):
+        score = random.randint(3, 9)
+        return {**extra, "score": f"{score}/10" if drift else score, "feedback": "Mock feedback.", "assessment": "Partial"}
+
+    match = re.search(r"Evaluate each of the following (\d+) answers", prompt)
+    if match:
+        return json.dumps({"evaluations": [evaluation(answer=i) for i in range(1, int(match.group(1)) + 1)]})
+    return json.dumps(evaluation())
+
+
+def reply_for(prompt: str) -> str:
+    """
+    Build a completion in the format the prompt asks for.
+    """
+    content = text_reply_for(prompt)
+    if random.random() < config["format_drift_rate"]:
+        content = content.replace("Score:", "**Score:**").replace("\nQ", "\nQuestion ")
+    return content
+
+
+def text_reply_for(prompt: str) -> str:
+    match = re.search(r"Generate exactly (\d+) unique", prompt)
+    if match:
+        count = int(match.group(1))
+        return "\n".join(
+            f"Q{i}: Mock question {uuid.uuid4().hex[:8]} about handling scenario {i}?\n"
+            f"A{i}: 1) Reproduce the issue 2) Check logs and metrics 3) Isolate the component 4) Fix and monitor"
+            for i in range(1, count + 1)
+        )
+    match = re.search(r"Evaluate each of the following (\d+) answers", prompt)
+    if match:
+        return "\n".join(
+            f"Answer {i}:\nScore: {random.randint(3, 9)}/10\nFeedback: Mock feedback.\nAssessment: Partial"
+            for i in range(1, int(match.group(1)) + 1)
+        )
+    if "Score:" in prompt:
+        return f"Score: {random.randint(3, 9)}/10\nFeedback: Mock feedback.\nAssessment: Partial"
+    return "\n".join(f"Q{i}: Mock question {i}?" for i in range(1, 6))
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    prompt = "\n".join(message.get("content", "") for message in body.get("messages", []))
+    await simulate_latency(config["latency_ms"])
+    failure = injected_failure()
+    if failure is not None:
+        return failure
+
+    json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+    content = json_reply_for(prompt) if json_mode else reply_for(prompt)
+    completion_id = f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+    model = body.get("model", "gpt-3.5-turbo")
+
+    if body.get("stream"):
+        counters["chat_stream"] += 1
+
+        async def events():
+            # Roughly one token (~4 characters) per chunk
+            for start in range(0, len(content), 4):
+                chunk = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {"content": content[start:start + 4]}, "finish_reason": None}]
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(config["stream_chunk_ms"] / 1000)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    counters["chat"] += 1
+    prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(content)
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    }
+
+
+@app.post("/v1/audio/transcriptions")
+async def audio_transcriptions(file: UploadFile = File(...), model: str = Form("whisper-1"),
+                               language: str = Form("en")):
+    await file.read()
+    await simulate_latency(config["transcribe_latency_ms"])
+    failure = injected_failure()
+    if failure is not None:
+        return failure
+    counters["transcriptions"] += 1
+    return {"text": transcript_reply()}
+
+
+@app.get("/mock/config")
+async def get_config():
+    return {"config": config, "counters": counters}
+
+
+@app.post("/mock/config")
+async def update_config(request: Request):
+    """
+    Change latency/failure settings while a load test is running.
+    """
+    updates = await request.json()
+    for key, value in updates.items():
+        if key in config:
+            config[key] = float(value)
+    return {"config": config}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a local mock of the OpenAI API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=config["latency_ms"], help="mean chat completion latency")
+    parser.add_argument("--jitter-ms", type=float, default=config["jitter_ms"], help="latency standard deviation")
+    parser.add_argument("--transcribe-latency-ms", type=float, default=config["transcribe_latency_ms"])
+    parser.add_argument("--failure-rate", type=float, default=config["failure_rate"], help="fraction of calls that fail")
+    parser.add_argument("--transcript-repeat-rate", type=float, default=config["transcript_repeat_rate"],
+                        help="fraction of transcriptions that return the same fixed answer")
+    args = parser.parse_args()
+
+    config.update({
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "transcribe_latency_ms": args.transcribe_latency_ms,
+        "failure_rate": args.failure_rate,
+        "transcript_repeat_rate": args.transcript_repeat_rate
+    })
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,130 @@
+import math
+import re
+from collections import Counter, OrderedDict
+from typing import Dict, Optional
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has
+have having he her here hers him his how i if in into is it its itself just like me more most my
+no nor not now of off on once only or other our out over own same she should so some such than
+that the their them then there these they this those through to too under until up very was we
+were what when where which while who whom why will with would you your yes okay ok um uh yeah
+well actually basically really think know thing things something mean kind sort
+""".split())
+
+
+_SUFFIXES = ("ations", "ation", "ions", "ion", "ing", "ed", "es", "s")
+
+
+def _stem(word: str) -> str:
+    # Crude suffix stripping so "encrypted"/"encryption" or "tokens"/"token" match
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[:-len(suffix)]
+    return word
+
+
+def content_terms(text: str) -> list:
+    """
+    Lower-cased, stemmed words of `text` without stopwords or trailing punctuation.
+    """
+    terms = (word.rstrip(".-") for word in _WORD.findall(text.lower()))
+    return [_stem(term) for term in terms if term and term not in STOPWORDS]
+
+
+class AnswerPreScorer:
+    """
+    Cheap local first pass over an answer before it is sent to the LLM grader.
+
+    Only near-empty answers are scored here: fewer than `min_words` words, or no
+    content terms at all ("um, okay, yeah"). They get 0 without an LLM call.
+    Lexical overlap with the question and model answer is not a correctness signal,
+    because a correct paraphrase can share no terms with the reference. It is therefore
+    only measured: TF-IDF similarity below `low_overlap_similarity` is counted, and the
+    answer still goes to the LLM. IDF weights come from the last `max_references`
+    distinct question/model-answer texts.
+    """
+
+    def __init__(self, min_words: int = 3, low_overlap_similarity: float = 0.05, max_references: int = 2000):
+        self.min_words = min_words
+        self.low_overlap_similarity = low_overlap_similarity
+        self.max_references = max_references
+        self._document_frequency: Counter = Counter()
+        # reference text -> its distinct terms, oldest first; evicted references are
+        # subtracted from the document frequencies so both stay bounded
+        self._references: "OrderedDict[str, frozenset]" = OrderedDict()
+        self.evaluated = 0
+        self.too_short = 0
+        self.low_overlap = 0
+        self.sent_to_llm = 0
+
+    def _observe(self, reference: str):
+        if reference in self._references:
+            self._references.move_to_end(reference)
+            return
+        terms = frozenset(content_terms(reference))
+        self._references[reference] = terms
+        self._document_frequency.update(terms)
+        while len(self._references) > self.max_references:
+            _, evicted = self._references.popitem(last=False)
+            self._document_frequency.subtract(evicted)
+            for term in evicted:
+                if self._document_frequency[term] <= 0:
+                    del self._document_frequency[term]
+
+    def _vector(self, terms: list) -> Dict[str, float]:
+        counts = Counter(terms)
+        documents = len(self._references)
+        # Smoothed IDF so unseen terms still carry weight
+        return {
+            term: count * (math.log((1 + documents) / (1 + self._document_frequency[term])) + 1)
+            for term, count in counts.items()
+        }
+
+    def similarity(self, answer: str, reference: str) -> float:
+        """
+        TF-IDF cosine similarity between an answer and a reference text.
+        """
+        a, b = self._vector(content_terms(answer)), self._vector(content_terms(reference))
+        dot = sum(weight * b.get(term, 0.0) for term, weight in a.items())
+        norm = math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values()))
+        return dot / norm if norm else 0.0
+
+    def score(self, transcription: str, question_data: dict) -> Optional[dict]:
+        """
+        Return a validation result for a near-empty answer, or None if the LLM should grade it.
+        """
+        self.evaluated += 1
+        if len(transcription.split()) < self.min_words or not content_terms(transcription):
+            self.too_short += 1
+            return {
+                "result": "Incorrect",
+                "feedback": "The answer is too short to demonstrate any understanding of the question.",
+                "score": 0
+            }
+
+        if question_data.get("model_answer"):
+            reference = f"{question_data.get('question', '')}\n{question_data['model_answer']}"
+            self._observe(reference)
+            if self.similarity(transcription, reference) < self.low_overlap_similarity:
+                self.low_overlap += 1
+
+        self.sent_to_llm += 1
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "evaluated": self.evaluated,
+            "too_short": self.too_short,
+            "low_overlap_sent_to_llm": self.low_overlap,
+            "sent_to_llm": self.sent_to_llm,
+            "llm_calls_saved": self.too_short,
+            "saved_rate": round(self.too_short / self.evaluated, 4) if self.evaluated else 0.0,
+            "reference_documents": len(self._references),
+            "vocabulary": len(self._document_frequency),
+            "min_words": self.min_words,
+            "low_overlap_similarity": self.low_overlap_similarity,
+        }
@@ -0,0 +1,88 @@
+import copy
+import random
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+
+class QuestionSetCache:
+    """
+    LRU + TTL cache of generated question sets keyed by (designation, experience, difficulty).
+
+    Each key holds up to `variants_per_key` independently generated sets. Until a key
+    has that many live sets every lookup is a miss, so callers keep generating fresh
+    sets; after that a random set is served on each hit.
+    """
+
+    def __init__(self, max_keys: int = 256, ttl_seconds: float = 3600, variants_per_key: int = 1):
+        self.max_keys = max_keys
+        self.ttl_seconds = ttl_seconds
+        self.variants_per_key = max(1, variants_per_key)
+        self._entries: "OrderedDict[Tuple[str, str, str], List[Tuple[float, List[dict]]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(designation: str, experience: str, difficulty: str) -> Tuple[str, str, str]:
+        return (
+            " ".join(designation.lower().split()),
+            " ".join(experience.lower().split()),
+            " ".join(difficulty.lower().split()),
+        )
+
+    def _live_sets(self, key) -> List[Tuple[float, List[dict]]]:
+        sets = self._entries.get(key)
+        if not sets:
+            return []
+        now = time.monotonic()
+        live = [entry for entry in sets if now - entry[0] < self.ttl_seconds]
+        self.expirations += len(sets) - len(live)
+        if live:
+            self._entries[key] = live
+        else:
+            del self._entries[key]
+        return live
+
+    def get(self, designation: str, experience: str, difficulty: str) -> Optional[List[dict]]:
+        """
+        Return a copy of a cached question set, or None on a miss.
+        """
+        key = self.make_key(designation, experience, difficulty)
+        live = self._live_sets(key)
+        if len(live) < self.variants_per_key:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(random.choice(live)[1])
+
+    def put(self, designation: str, experience: str, difficulty: str, questions: List[dict]):
+        key = self.make_key(designation, experience, difficulty)
+        live = self._live_sets(key)
+        live.append((time.monotonic(), copy.deepcopy(questions)))
+        # Keep only the newest variants for this key
+        self._entries[key] = live[-self.variants_per_key:]
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "keys": len(self._entries),
+            "sets": sum(len(sets) for sets in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "max_keys": self.max_keys,
+            "ttl_seconds": self.ttl_seconds,
+            "variants_per_key": self.variants_per_key,
+        }
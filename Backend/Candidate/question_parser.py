@@ -0,0 +1,73 @@
+from typing import List
+
+DEFAULT_KEY_POINTS = ['Role-specific knowledge', 'Technical accuracy', 'Practical application']
+
+
+def _is_numbered(line: str, prefix: str) -> bool:
+    # Match Q1-Q20 / A1-A20 format
+    return line.startswith(prefix) and ':' in line and any(str(i) in line[:3] for i in range(1, 21))
+
+
+class QuestionStreamParser:
+    """
+    Incremental parser for "Qn: ..." / "An: ..." completions.
+
+    Text can be fed in arbitrary chunks (e.g. tokens from a streamed completion);
+    each question is returned as soon as its answer line has been terminated.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._current = None
+
+    def _parse_line(self, line: str) -> List[dict]:
+        completed = []
+        line = line.strip()
+        if not line:
+            return completed
+
+        if _is_numbered(line, 'Q'):
+            if self._current:
+                completed.append(self._current)
+            self._current = {
+                'question': line.split(':', 1)[1].strip(),
+                'key_points': list(DEFAULT_KEY_POINTS)
+            }
+        elif _is_numbered(line, 'A') and self._current:
+            self._current['model_answer'] = line.split(':', 1)[1].strip()
+            completed.append(self._current)
+            self._current = None
+        return completed
+
+    def feed(self, chunk: str) -> List[dict]:
+        """
+        Consume a chunk of text and return the questions it completed.
+        """
+        self._buffer += chunk
+        completed = []
+        while '\n' in self._buffer:
+            line, self._buffer = self._buffer.split('\n', 1)
+            completed.extend(self._parse_line(line))
+        return completed
+
+    def close(self) -> List[dict]:
+        """
+        Flush the trailing partial line and return any questions it completed.
+        """
+        completed = self._parse_line(self._buffer)
+        self._buffer = ""
+        # Add the last question if it exists
+        if self._current and 'model_answer' in self._current:
+            completed.append(self._current)
+        self._current = None
+        return completed
+
+
+def parse_questions(content: str) -> List[dict]:
+    """
+    Parse a complete "Qn:/An:" completion into question dicts.
+    """
+    parser = QuestionStreamParser()
+    questions = parser.feed(content)
+    questions.extend(parser.close())
+    return questions
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """
+    Raised when a job is submitted while the queue is at capacity.
+    """
+
+
+class CallbackNotAllowed(ValueError):
+    """
+    Raised when a callback URL does not match one of the allowed callback origins.
+    """
+
+
+def url_origin(url: str) -> str:
+    """
+    Normalise a URL to "scheme://host:port" for comparison against the allowlist.
+    """
+    parts = urlsplit(url.strip())
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return ""
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    return f"{parts.scheme}://{parts.hostname.lower()}:{port}"
+
+
+class ScoringJobQueue:
+    """
+    In-process worker pool for scoring audio answers in the background.
+
+    Jobs are accepted immediately and processed by `workers` asyncio tasks calling
+    `handler(payload)`. Finished jobs stay queryable for `result_ttl` seconds and can
+    optionally be pushed to a webhook (`callback_url`) when they complete.
+
+    Callbacks are only sent to URLs whose origin is listed in `callback_origins`; with
+    no origins configured, callback URLs are refused and clients have to poll.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[dict], Awaitable[dict]],
+        workers: int = 4,
+        max_pending: int = 1000,
+        result_ttl: float = 3600,
+        callback_timeout: float = 10.0,
+        callback_origins: Iterable[str] = ()
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.callback_timeout = callback_timeout
+        self.callback_origins = {url_origin(origin) for origin in callback_origins} - {""}
+        self.jobs: "OrderedDict[str, dict]" = OrderedDict()
+        self._payloads = {}
+        self._events = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._http: Optional[httpx.AsyncClient] = None
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        # Redirects are not followed, so an allowed origin cannot bounce a callback elsewhere
+        self._http = httpx.AsyncClient(timeout=self.callback_timeout, follow_redirects=False)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Started {self.workers} scoring workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._http is not None:
+            await self._http.aclose()
+
+    def check_callback_url(self, url: str):
+        """
+        Raise CallbackNotAllowed unless `url` points at an allowed callback origin.
+        """
+        if not self.callback_origins:
+            raise CallbackNotAllowed("Callbacks are disabled; poll the job status instead")
+        if url_origin(url) not in self.callback_origins:
+            raise CallbackNotAllowed("callback_url is not an allowed callback origin")
+
+    def submit(self, payload: dict, callback_url: Optional[str] = None) -> dict:
+        """
+        Queue a payload for scoring and return the new job record.
+        """
+        if callback_url:
+            self.check_callback_url(callback_url)
+        self._prune()
+        job_id = str(uuid.uuid4())
+        job = {
+            "job_id": job_id,
+            "status": "queued",
+            "session_id": payload.get("session_id"),
+            "question_number": payload.get("question_number"),
+            "callback_url": callback_url,
+            "submitted_at": datetime.now().isoformat(),
+            "finished_at": None,
+            "result": None,
+            "error": None
+        }
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            raise JobQueueFull(f"Scoring queue is full ({self.max_pending} pending jobs)")
+        self.jobs[job_id] = job
+        self._payloads[job_id] = payload
+        self._events[job_id] = asyncio.Event()
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[dict]:
+        """
+        Wait up to `timeout` seconds for a job to finish and return its record.
+        """
+        event = self._events.get(job_id)
+        if event is not None and timeout > 0:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.get(job_id)
+
+    def stats(self) -> dict:
+        counts = {}
+        for job in self.jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "jobs": counts
+        }
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            payload = self._payloads.pop(job_id, None)
+            try:
+                if job is None or payload is None:
+                    continue
+                job["status"] = "processing"
+                try:
+                    job["result"] = await self.handler(payload)
+                    job["status"] = "completed"
+                except Exception as e:
+                    logger.error(f"Scoring job {job_id} failed: {str(e)}", exc_info=True)
+                    job["status"] = "failed"
+                    job["error"] = str(e)
+                job["finished_at"] = datetime.now().isoformat()
+                job["_finished"] = time.monotonic()
+                self._events[job_id].set()
+                if job["callback_url"]:
+                    await self._notify(job)
+            finally:
+                self._queue.task_done()
+
+    async def _notify(self, job: dict):
+        try:
+            self.check_callback_url(job["callback_url"])
+            await self._http.post(job["callback_url"], json=self.public(job))
+        except (CallbackNotAllowed, httpx.HTTPError) as e:
+            logger.warning(f"Callback for job {job['job_id']} failed: {str(e)}")
+
+    def _prune(self):
+        # Drop finished jobs whose results have outlived result_ttl
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if "_finished" in job and now - job["_finished"] > self.result_ttl
+        ]
+        for job_id in expired:
+            self.jobs.pop(job_id, None)
+            self._events.pop(job_id, None)
+
+    @staticmethod
+    def public(job: dict) -> dict:
+        return {key: value for key, value in job.items() if not key.startswith("_")}
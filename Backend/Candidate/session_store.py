@@ -0,0 +1,435 @@
+import asyncio
+import base64
+import copy
+import json
+import logging
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(value: Any) -> str:
+    def default(obj):
+        if isinstance(obj, (bytes, bytearray)):
+            return {"__bytes__": base64.b64encode(obj).decode("ascii")}
+        raise TypeError(f"Cannot store {type(obj).__name__} in a session")
+    return json.dumps(value, default=default)
+
+
+def _decode(raw) -> Any:
+    def hook(obj):
+        if set(obj) == {"__bytes__"}:
+            return base64.b64decode(obj["__bytes__"])
+        return obj
+    return json.loads(raw, object_hook=hook)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Cheap estimate of the bytes a record holds (payload sizes plus container overhead).
+    """
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value) + 50
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return 32
+
+
+class SessionNotFound(LookupError):
+    """
+    Raised when writing to a record that does not exist or has expired.
+    """
+
+
+class SessionStore(ABC):
+    """
+    Async key/record store for interview sessions and uploaded CVs.
+
+    Records are flat dicts of JSON-serialisable fields. Callers never mutate a
+    record they read; every change goes through `set`, `update`, `set_item` or
+    `incr` so that it is visible to (and atomic across) every worker. Only `set`
+    creates a record; the other writes raise SessionNotFound if it has expired or
+    been evicted since it was read.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[dict]:
+        ...
+
+    async def exists(self, key: str) -> bool:
+        return await self.get(key) is not None
+
+    @abstractmethod
+    async def set(self, key: str, record: dict):
+        ...
+
+    @abstractmethod
+    async def update(self, key: str, fields: dict):
+        """
+        Overwrite top-level fields of an existing record.
+        """
+
+    @abstractmethod
+    async def set_item(self, key: str, field: str, item_key: str, value: Any):
+        """
+        Set one entry of a dict-valued field (e.g. a single answer) without rewriting the rest.
+        """
+
+    @abstractmethod
+    async def incr(self, key: str, field: str, amount: int = 1) -> int:
+        """
+        Atomically add `amount` to an integer field and return the new value.
+        """
+
+    @abstractmethod
+    async def acquire_lease(self, key: str, field: str, ttl_seconds: float) -> bool:
+        """
+        Atomically mark `field` of a record as held for `ttl_seconds`. Returns False
+        if another caller holds an unexpired lease on it.
+        """
+
+    @abstractmethod
+    async def release_lease(self, key: str, field: str):
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str):
+        ...
+
+    async def sweep(self) -> int:
+        """
+        Drop expired records and return how many were removed.
+        """
+        return 0
+
+    @abstractmethod
+    async def stats(self) -> dict:
+        ...
+
+    async def close(self):
+        pass
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local backend. Only suitable for a single uvicorn worker.
+
+    Records idle for longer than `ttl_seconds` are dropped by `sweep()`, and the least
+    recently used records are evicted whenever the estimated total exceeds `max_bytes`.
+    """
+
+    def __init__(self, namespace: str = "session", ttl_seconds: float = 0, max_bytes: int = 0):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        # key -> record, ordered from least to most recently used
+        self._records: "OrderedDict[str, dict]" = OrderedDict()
+        self._last_access = {}
+        self._sizes = {}
+        self._total_bytes = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def _touch(self, key):
+        self._records.move_to_end(key)
+        self._last_access[key] = time.monotonic()
+
+    def _resize(self, key):
+        size = estimate_size(self._records[key])
+        self._total_bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        self._touch(key)
+        # Evict least recently used records (never the one just written) above the ceiling
+        while self.max_bytes and self._total_bytes > self.max_bytes and len(self._records) > 1:
+            oldest = next(iter(self._records))
+            logger.warning(f"Evicting {self.namespace} {oldest}: store above {self.max_bytes} bytes")
+            self._remove(oldest)
+            self.evicted += 1
+
+    def _remove(self, key):
+        self._records.pop(key, None)
+        self._last_access.pop(key, None)
+        self._total_bytes -= self._sizes.pop(key, 0)
+
+    async def get(self, key):
+        record = self._records.get(key)
+        if record is None:
+            return None
+        self._touch(key)
+        return copy.deepcopy(record)
+
+    async def exists(self, key):
+        return key in self._records
+
+    async def set(self, key, record):
+        self._records[key] = copy.deepcopy(record)
+        self._resize(key)
+
+    def _existing(self, key) -> dict:
+        record = self._records.get(key)
+        if record is None:
+            raise SessionNotFound(key)
+        return record
+
+    async def update(self, key, fields):
+        self._existing(key).update(copy.deepcopy(fields))
+        self._resize(key)
+
+    async def set_item(self, key, field, item_key, value):
+        self._existing(key).setdefault(field, {})[item_key] = copy.deepcopy(value)
+        self._resize(key)
+
+    async def incr(self, key, field, amount=1):
+        record = self._existing(key)
+        record[field] = record.get(field, 0) + amount
+        self._touch(key)
+        return record[field]
+
+    async def acquire_lease(self, key, field, ttl_seconds):
+        record = self._existing(key)
+        now = time.time()
+        if record.get(field, 0) > now:
+            return False
+        record[field] = now + ttl_seconds
+        self._touch(key)
+        return True
+
+    async def release_lease(self, key, field):
+        record = self._records.get(key)
+        if record is not None:
+            record.pop(field, None)
+
+    async def delete(self, key):
+        self._remove(key)
+
+    async def sweep(self):
+        if not self.ttl_seconds:
+            return 0
+        cutoff = time.monotonic() - self.ttl_seconds
+        # Records are in access order, so stop at the first one that is still fresh
+        expired = []
+        for key in self._records:
+            if self._last_access[key] > cutoff:
+                break
+            expired.append(key)
+        for key in expired:
+            self._remove(key)
+        self.expired += len(expired)
+        return len(expired)
+
+    async def stats(self):
+        return {
+            "backend": "memory",
+            "entries": len(self._records),
+            "estimated_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "expired": self.expired,
+            "evicted": self.evicted
+        }
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Networked backend: one Redis hash per record, one JSON-encoded hash field per
+    top-level field. Entries of the dict-valued `item_fields` are stored as
+    "<field>.<item>" so single answers can be written independently, and counters
+    use HINCRBY.
+
+    Works with any redis.asyncio-compatible client, e.g. fakeredis for local runs.
+    Idle expiry uses a sliding EXPIRE refreshed on every access; the memory ceiling
+    is Redis' own maxmemory policy. Writes to an existing record run as Lua scripts
+    that check the key first, so a write racing with expiry cannot recreate a
+    partial hash.
+    """
+
+    # KEYS[1] = record, ARGV[1] = ttl, ARGV[2..] = field/value pairs
+    _HSET_EXISTING = """
+        if redis.call('EXISTS', KEYS[1]) == 0 then return false end
+        redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+        if tonumber(ARGV[1]) > 0 then redis.call('EXPIRE', KEYS[1], ARGV[1]) end
+        return 1
+    """
+    # KEYS[1] = record, ARGV = ttl, field, amount
+    _HINCRBY_EXISTING = """
+        if redis.call('EXISTS', KEYS[1]) == 0 then return false end
+        local value = redis.call('HINCRBY', KEYS[1], ARGV[2], ARGV[3])
+        if tonumber(ARGV[1]) > 0 then redis.call('EXPIRE', KEYS[1], ARGV[1]) end
+        return value
+    """
+
+    # KEYS[1] = record, ARGV = ttl, field, held-until, now
+    _ACQUIRE_LEASE = """
+        if redis.call('EXISTS', KEYS[1]) == 0 then return false end
+        local held = redis.call('HGET', KEYS[1], ARGV[2])
+        if held and tonumber(held) > tonumber(ARGV[4]) then return 0 end
+        redis.call('HSET', KEYS[1], ARGV[2], ARGV[3])
+        if tonumber(ARGV[1]) > 0 then redis.call('EXPIRE', KEYS[1], ARGV[1]) end
+        return 1
+    """
+
+    def __init__(self, client, namespace: str = "session", item_fields=(), ttl_seconds: float = 0,
+                 memory_sample: int = 20):
+        self.client = client
+        self.namespace = namespace
+        self.item_fields = tuple(item_fields)
+        self.ttl_seconds = int(ttl_seconds)
+        # Records sampled with MEMORY USAGE for stats(); 0 disables the estimate
+        self.memory_sample = memory_sample
+        self._hset_existing = client.register_script(self._HSET_EXISTING)
+        self._hincrby_existing = client.register_script(self._HINCRBY_EXISTING)
+        self._acquire_lease = client.register_script(self._ACQUIRE_LEASE)
+
+    async def _refresh(self, key: str):
+        if self.ttl_seconds:
+            await self.client.expire(self._key(key), self.ttl_seconds)
+
+    def _key(self, key: str) -> str:
+        return f"hired:{self.namespace}:{key}"
+
+    async def get(self, key):
+        raw = await self.client.hgetall(self._key(key))
+        if not raw:
+            return None
+        await self._refresh(key)
+        record = {field: {} for field in self.item_fields}
+        for field, value in raw.items():
+            field = field.decode() if isinstance(field, bytes) else field
+            if field == "_":
+                continue
+            parent, _, item_key = field.partition(".")
+            if item_key and parent in self.item_fields:
+                record[parent][item_key] = _decode(value)
+            else:
+                record[field] = _decode(value)
+        return record
+
+    async def exists(self, key):
+        return bool(await self.client.exists(self._key(key)))
+
+    def _flatten(self, fields: dict) -> dict:
+        mapping = {}
+        for field, value in fields.items():
+            if field in self.item_fields:
+                for item_key, item in value.items():
+                    mapping[f"{field}.{item_key}"] = _encode(item)
+            else:
+                mapping[field] = _encode(value)
+        return mapping
+
+    async def set(self, key, record):
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self._key(key))
+            # Empty item fields have no hash entries; the marker keeps the record present
+            pipe.hset(self._key(key), mapping={"_": "0", **self._flatten(record)})
+            if self.ttl_seconds:
+                pipe.expire(self._key(key), self.ttl_seconds)
+            await pipe.execute()
+
+    async def _hset(self, key, mapping: dict):
+        args = [self.ttl_seconds]
+        for field, value in mapping.items():
+            args += [field, value]
+        if await self._hset_existing(keys=[self._key(key)], args=args) is None:
+            raise SessionNotFound(key)
+
+    async def update(self, key, fields):
+        mapping = self._flatten(fields)
+        if mapping:
+            await self._hset(key, mapping)
+        elif not await self.exists(key):
+            raise SessionNotFound(key)
+
+    async def set_item(self, key, field, item_key, value):
+        await self._hset(key, {f"{field}.{item_key}": _encode(value)})
+
+    async def incr(self, key, field, amount=1):
+        value = await self._hincrby_existing(keys=[self._key(key)], args=[self.ttl_seconds, field, amount])
+        if value is None:
+            raise SessionNotFound(key)
+        return int(value)
+
+    async def acquire_lease(self, key, field, ttl_seconds):
+        now = time.time()
+        acquired = await self._acquire_lease(keys=[self._key(key)],
+                                             args=[self.ttl_seconds, field, _encode(now + ttl_seconds), now])
+        if acquired is None:
+            raise SessionNotFound(key)
+        return bool(acquired)
+
+    async def release_lease(self, key, field):
+        await self.client.hdel(self._key(key), field)
+
+    async def delete(self, key):
+        await self.client.delete(self._key(key))
+
+    async def stats(self):
+        """
+        Count records and extrapolate their memory from MEMORY USAGE on the first
+        `memory_sample` of them. The estimate is None when disabled or when the server
+        does not support the command (e.g. fakeredis).
+        """
+        from redis.exceptions import ResponseError
+
+        entries = 0
+        sampled_bytes = []
+        async for redis_key in self.client.scan_iter(match=self._key("*"), count=500):
+            entries += 1
+            if len(sampled_bytes) < self.memory_sample:
+                try:
+                    sampled_bytes.append(int(await self.client.memory_usage(redis_key) or 0))
+                except ResponseError as e:
+                    logger.info(f"MEMORY USAGE unavailable, skipping the session memory estimate: {str(e)}")
+                    self.memory_sample = 0
+        estimated_bytes = None
+        if self.memory_sample:
+            estimated_bytes = sum(sampled_bytes) * entries // len(sampled_bytes) if sampled_bytes else 0
+        return {
+            "backend": "redis",
+            "entries": entries,
+            "estimated_bytes": estimated_bytes,
+            "memory_sampled_entries": len(sampled_bytes) if estimated_bytes is not None else 0,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+    async def close(self):
+        await self.client.close()
+
+
+def create_session_store(url: str, namespace: str, item_fields=(),
+                         ttl_seconds: float = 0, max_bytes: int = 0) -> SessionStore:
+    """
+    Build a store from a URL: empty or "memory://" for in-process, "redis://..." for
+    Redis, or "fakeredis://" for an in-process Redis stand-in.
+    """
+    if not url or url.startswith("memory://"):
+        return InMemorySessionStore(namespace, ttl_seconds, max_bytes)
+    if url.startswith("fakeredis://"):
+        from fakeredis import aioredis as fake_aioredis
+        return RedisSessionStore(fake_aioredis.FakeRedis(), namespace, item_fields, ttl_seconds)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        from redis import asyncio as aioredis
+        logger.info(f"Using Redis session store for {namespace}")
+        return RedisSessionStore(aioredis.Redis.from_url(url), namespace, item_fields, ttl_seconds)
+    raise ValueError(f"Unsupported session store URL: {url}")
+
+
+async def run_sweeper(stores, interval: float):
+    """
+    Background task: periodically sweep expired records from every store.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        for store in stores:
+            try:
+                removed = await store.sweep()
+                if removed:
+                    logger.info(f"Swept {removed} expired {store.namespace} records")
+            except Exception as e:
+                logger.error(f"Session sweep failed for {store.namespace}: {str(e)}")
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, List, Optional
+
+from pydub.silence import detect_silence
+
+from audio_preprocess import MIN_SPEECH_MS, SILENCE_THRESH_DBFS, decode_audio, encode_audio, speech_ranges
+
+logger = logging.getLogger(__name__)
+
+# ------------------ Configuration ------------------
+
+# Re-examine the recording each time this many new bytes arrive (~4 s of webm/opus)
+STREAM_STEP_BYTES = int(os.getenv("STREAM_STEP_BYTES", str(24 * 1024)))
+# Only cut at a pause at least this long, and keep this much un-committed audio at the tail
+STREAM_CUT_SILENCE_MS = int(os.getenv("STREAM_CUT_SILENCE_MS", "500"))
+STREAM_TAIL_GUARD_MS = 1000
+STREAM_MIN_SEGMENT_MS = 3000
+# Largest recording accepted over one stream; every pass re-decodes the whole buffer
+STREAM_MAX_BYTES = int(os.getenv("STREAM_MAX_BYTES", str(10 * 1024 * 1024)))
+
+
+class RecordingTooLarge(ValueError):
+    """
+    Raised when a streamed chunk would take the recording past `max_bytes`.
+    """
+
+
+class IncrementalTranscriber:
+    """
+    Transcribes a recording while it is still being streamed in.
+
+    Browser MediaRecorder chunks are not independently decodable, so the growing
+    buffer is re-decoded periodically; every complete span that ends in a pause is
+    transcribed and committed. When recording stops only the uncommitted tail is
+    left to transcribe; a span whose transcription failed stays uncommitted and is
+    retried as part of that tail, and a failure of the final pass is raised.
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[[bytes, str], Awaitable[str]],
+        filename: str = "answer.webm",
+        on_partial: Optional[Callable[[str], Awaitable[None]]] = None,
+        max_bytes: int = STREAM_MAX_BYTES
+    ):
+        self.transcribe = transcribe
+        self.filename = filename
+        self.on_partial = on_partial
+        self.max_bytes = max_bytes
+        self._buffer = bytearray()
+        self._checked_bytes = 0
+        self._committed_ms = 0
+        self._texts: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def text(self) -> str:
+        return " ".join(t for t in self._texts if t).strip()
+
+    @property
+    def size(self) -> int:
+        return len(self._buffer)
+
+    def feed(self, chunk: bytes):
+        """
+        Append a chunk; start a background commit pass if enough new audio arrived.
+        Raises RecordingTooLarge (without keeping the chunk) once `max_bytes` would be exceeded.
+        """
+        if len(self._buffer) + len(chunk) > self.max_bytes:
+            raise RecordingTooLarge(f"Recording exceeds {self.max_bytes} bytes")
+        self._buffer.extend(chunk)
+        idle = self._task is None or self._task.done()
+        if idle and len(self._buffer) - self._checked_bytes >= STREAM_STEP_BYTES:
+            self._checked_bytes = len(self._buffer)
+            self._task = asyncio.create_task(self._commit(final=False))
+
+    async def finalize(self) -> str:
+        """
+        Wait for in-flight work, transcribe the remaining tail and return the full text.
+        """
+        if self._task is not None:
+            # A failed background pass left its audio uncommitted, so the final pass
+            # below transcribes it again together with the tail
+            result, = await asyncio.gather(self._task, return_exceptions=True)
+            if isinstance(result, Exception):
+                logger.warning(f"Incremental transcription failed, retrying with the tail: {str(result)}")
+        await self._commit(final=True)
+        return self.text
+
+    def cancel(self):
+        """
+        Abandon the recording: stop any in-flight pass and drop the buffer.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._buffer = bytearray()
+
+    def _next_cut(self, segment, final: bool) -> Optional[int]:
+        end = len(segment)
+        if final:
+            return end if end > self._committed_ms else None
+        window_end = end - STREAM_TAIL_GUARD_MS
+        if window_end - self._committed_ms < STREAM_MIN_SEGMENT_MS:
+            return None
+        pauses = detect_silence(
+            segment[self._committed_ms:window_end],
+            min_silence_len=STREAM_CUT_SILENCE_MS,
+            silence_thresh=SILENCE_THRESH_DBFS
+        )
+        if not pauses:
+            return None
+        # Cut in the middle of the last pause so no word is split
+        start, stop = pauses[-1]
+        cut = self._committed_ms + (start + stop) // 2
+        return cut if cut - self._committed_ms >= STREAM_MIN_SEGMENT_MS else None
+
+    async def _commit(self, final: bool):
+        data = bytes(self._buffer)
+        if not data:
+            return
+        try:
+            segment = await asyncio.to_thread(decode_audio, data, self.filename)
+        except Exception as e:
+            if final:
+                raise
+            logger.debug(f"Partial recording not decodable yet: {str(e)}")
+            return
+
+        cut = self._next_cut(segment, final)
+        if cut is None:
+            return
+        piece = segment[self._committed_ms:cut]
+
+        speech = await asyncio.to_thread(speech_ranges, piece)
+        if sum(stop - start for start, stop in speech) < MIN_SPEECH_MS:
+            self._committed_ms = cut
+            return
+        encoded = await asyncio.to_thread(encode_audio, piece)
+        text = (await self.transcribe(encoded, "segment.ogg")).strip()
+        # Only advance past audio whose text was actually received
+        self._committed_ms = cut
+        self._texts.append(text)
+        if self.on_partial is not None and not final:
+            await self.on_partial(self.text)
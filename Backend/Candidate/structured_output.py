@@ -0,0 +1,164 @@
+import json
+from typing import Any, Dict
+
+# ------------------ Response Schemas ------------------
+
+QUESTION_SET_SCHEMA = {
+    "type": "object",
+    "required": ["questions"],
+    "properties": {
+        "questions": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": ["question", "answer"],
+                "properties": {
+                    "question": {"type": "string", "minLength": 5},
+                    "answer": {"type": "string", "minLength": 1}
+                }
+            }
+        }
+    }
+}
+
+EVALUATION_SCHEMA = {
+    "type": "object",
+    "required": ["score", "feedback", "assessment"],
+    "properties": {
+        "score": {"type": "integer", "minimum": 0, "maximum": 10},
+        "feedback": {"type": "string"},
+        "assessment": {"type": "string", "enum": ["Correct", "Partial", "Incorrect"]}
+    }
+}
+
+BATCH_EVALUATION_SCHEMA = {
+    "type": "object",
+    "required": ["evaluations"],
+    "properties": {
+        "evaluations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["answer", *EVALUATION_SCHEMA["required"]],
+                "properties": {"answer": {"type": "integer", "minimum": 1}, **EVALUATION_SCHEMA["properties"]}
+            }
+        }
+    }
+}
+
+INTRO_SCRIPT_SCHEMA = {
+    "type": "object",
+    "required": ["personalized_intro", "overall_feedback"],
+    "properties": {
+        "personalized_intro": {"type": "string", "minLength": 20},
+        "overall_feedback": {"type": "string", "minLength": 1}
+    }
+}
+
+
+class SchemaError(ValueError):
+    """
+    Raised when a completion is not valid JSON or does not match its schema.
+    """
+
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+}
+
+
+def validate(instance: Any, schema: Dict[str, Any], path: str = "$"):
+    """
+    Check `instance` against the subset of JSON Schema used above (type, required,
+    properties, items, enum, minimum/maximum, minLength, minItems).
+    """
+    expected = schema.get("type")
+    if expected:
+        # bool is an int subclass but never a valid integer/number here
+        if not isinstance(instance, _TYPES[expected]) or (expected in ("integer", "number") and isinstance(instance, bool)):
+            raise SchemaError(f"{path}: expected {expected}, got {type(instance).__name__}")
+    if "enum" in schema and instance not in schema["enum"]:
+        raise SchemaError(f"{path}: {instance!r} is not one of {schema['enum']}")
+    if "minimum" in schema and instance < schema["minimum"]:
+        raise SchemaError(f"{path}: {instance} is below {schema['minimum']}")
+    if "maximum" in schema and instance > schema["maximum"]:
+        raise SchemaError(f"{path}: {instance} is above {schema['maximum']}")
+    if "minLength" in schema and len(instance.strip()) < schema["minLength"]:
+        raise SchemaError(f"{path}: string is shorter than {schema['minLength']}")
+    if expected == "object":
+        for field in schema.get("required", []):
+            if field not in instance:
+                raise SchemaError(f"{path}: missing required field '{field}'")
+        for field, subschema in schema.get("properties", {}).items():
+            if field in instance:
+                validate(instance[field], subschema, f"{path}.{field}")
+    elif expected == "array":
+        if len(instance) < schema.get("minItems", 0):
+            raise SchemaError(f"{path}: expected at least {schema['minItems']} items")
+        if "items" in schema:
+            for index, item in enumerate(instance):
+                validate(item, schema["items"], f"{path}[{index}]")
+
+
+def load_json(content: str) -> Any:
+    """
+    Decode a JSON completion, tolerating a surrounding ```json code fence.
+    """
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        raise SchemaError(f"Invalid JSON: {str(e)}") from e
+
+
+def parse_structured(content: str, schema: Dict[str, Any]) -> Any:
+    """
+    Decode and validate a JSON completion; raises SchemaError on any mismatch.
+    """
+    data = load_json(content)
+    validate(data, schema)
+    return data
+
+
+class ParseStats:
+    """
+    Per-call-site counters of completions, parse failures and the extra round trips they cost.
+    """
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _site(self, name: str) -> Dict[str, int]:
+        return self._counters.setdefault(name, {"completions": 0, "parse_failures": 0, "retries": 0})
+
+    def completion(self, name: str):
+        self._site(name)["completions"] += 1
+
+    def failure(self, name: str):
+        self._site(name)["parse_failures"] += 1
+
+    def retry(self, name: str):
+        self._site(name)["retries"] += 1
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "sites": {
+                name: {
+                    **counters,
+                    "failure_rate": round(counters["parse_failures"] / counters["completions"], 4) if counters["completions"] else 0.0,
+                    "retry_rate": round(counters["retries"] / counters["completions"], 4) if counters["completions"] else 0.0
+                }
+                for name, counters in self._counters.items()
+            }
+        }
@@ -0,0 +1,159 @@
+import logging
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # Fall back to a character-based estimate
+    tiktoken = None
+
+# Kept free of sibling-module imports so both Candidate/main.py and Backend/script.py can use it
+
+logger = logging.getLogger(__name__)
+
+# Chat format overhead per message (role/separators) and per reply priming
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+TRUNCATION_MARKER = " [...] "
+
+
+class TokenBudgeter:
+    """
+    Counts the tokens of every outgoing prompt and keeps variable inputs (CV text,
+    transcriptions) inside a per-endpoint prompt budget.
+
+    Uses tiktoken when installed and ~4 characters per token otherwise. Prompt and
+    completion sizes are recorded per endpoint so `max_tokens` can be sized from the
+    observed p95 instead of guessed.
+    """
+
+    def __init__(self, budgets: Dict[str, int], model: str = "gpt-3.5-turbo", history: int = 500):
+        self.budgets = budgets
+        self.model = model
+        self.history = history
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+        self._stats: Dict[str, dict] = {}
+
+    def count(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        return (len(text) + 3) // 4
+
+    def count_messages(self, messages: List[dict]) -> int:
+        return sum(TOKENS_PER_MESSAGE + self.count(m["content"]) for m in messages) + TOKENS_PER_REPLY
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Shorten `text` to about `max_tokens`, keeping its beginning and end.
+        """
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text)
+            head = max_tokens * 2 // 3
+            tail = max_tokens - head
+            return (self._encoding.decode(tokens[:head]) + TRUNCATION_MARKER
+                    + self._encoding.decode(tokens[-tail:] if tail else []))
+        head, tail = max_tokens * 8 // 3, max_tokens * 4 // 3
+        return text[:head] + TRUNCATION_MARKER + (text[-tail:] if tail else "")
+
+    def fit(self, endpoint: str, build: Callable[[str], List[dict]], text: str) -> List[dict]:
+        """
+        Return `build(text)`, truncating `text` first if the resulting messages would
+        exceed the endpoint's prompt budget.
+        """
+        budget = self.budgets.get(endpoint)
+        if not budget or self.count_messages(build(text)) <= budget:
+            return build(text)
+        # Measured with the marker as input so framing added only around non-empty
+        # input (e.g. a list header) is counted too
+        overhead = self.count_messages(build(TRUNCATION_MARKER))
+        original = self.count(text)
+        text = self.truncate(text, budget - overhead)
+        self._endpoint(endpoint)["truncated"] += 1
+        logger.warning(f"{endpoint}: input truncated from {original} to {self.count(text)} tokens "
+                       f"to fit the {budget}-token prompt budget")
+        return build(text)
+
+    def clip(self, endpoint: str, text: str, max_tokens: int) -> str:
+        """
+        Truncate one short input field (e.g. a job title repeated through a prompt) to
+        `max_tokens`, counting it as a truncation for `endpoint`.
+        """
+        original = self.count(text)
+        if original <= max_tokens:
+            return text
+        text = self.truncate(text, max_tokens - self.count(TRUNCATION_MARKER))
+        self._endpoint(endpoint)["truncated"] += 1
+        logger.warning(f"{endpoint}: field truncated from {original} to {self.count(text)} tokens")
+        return text
+
+    def _endpoint(self, endpoint: str) -> dict:
+        if endpoint not in self._stats:
+            self._stats[endpoint] = {
+                "calls": 0,
+                "truncated": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "completion_calls": 0,
+                "max_prompt_tokens": 0,
+                "max_completion_tokens": 0,
+                "max_tokens_requested": 0,
+                "recent_completions": deque(maxlen=self.history)
+            }
+        return self._stats[endpoint]
+
+    def record(self, endpoint: str, messages: List[dict], max_tokens: int,
+               response: Optional[dict] = None) -> int:
+        """
+        Log and accumulate the size of one call. Provider-reported usage from
+        `response` is preferred over the local prompt count when present.
+        """
+        usage = (response or {}).get("usage") or {}
+        prompt_tokens = usage.get("prompt_tokens") or self.count_messages(messages)
+        completion_tokens = usage.get("completion_tokens")
+
+        stats = self._endpoint(endpoint)
+        stats["calls"] += 1
+        stats["prompt_tokens"] += prompt_tokens
+        stats["max_prompt_tokens"] = max(stats["max_prompt_tokens"], prompt_tokens)
+        stats["max_tokens_requested"] = max(stats["max_tokens_requested"], max_tokens)
+        if completion_tokens is not None:
+            stats["completion_tokens"] += completion_tokens
+            stats["completion_calls"] += 1
+            stats["max_completion_tokens"] = max(stats["max_completion_tokens"], completion_tokens)
+            stats["recent_completions"].append(completion_tokens)
+
+        budget = self.budgets.get(endpoint)
+        if budget and prompt_tokens > budget:
+            logger.warning(f"{endpoint}: prompt of {prompt_tokens} tokens exceeds its {budget}-token budget")
+        logger.info(f"{endpoint}: prompt={prompt_tokens} completion={completion_tokens if completion_tokens is not None else '-'} "
+                    f"max_tokens={max_tokens} tokens")
+        return prompt_tokens
+
+    def stats(self) -> dict:
+        endpoints = {}
+        for endpoint, stats in self._stats.items():
+            recent = sorted(stats["recent_completions"])
+            p95 = recent[int(0.95 * (len(recent) - 1))] if recent else None
+            calls, completions = stats["calls"], stats["completion_calls"]
+            endpoints[endpoint] = {
+                **{k: v for k, v in stats.items() if k != "recent_completions"},
+                "budget": self.budgets.get(endpoint),
+                "mean_prompt_tokens": round(stats["prompt_tokens"] / calls, 1) if calls else 0.0,
+                "mean_completion_tokens": round(stats["completion_tokens"] / completions, 1) if completions else 0.0,
+                "p95_completion_tokens": p95,
+                # Observed p95 completion plus 20% headroom
+                "suggested_max_tokens": int(p95 * 1.2) + 1 if p95 is not None else None
+            }
+        return {
+            "counter": "tiktoken" if self._encoding is not None else "estimate",
+            "endpoints": endpoints
+        }
@@ -0,0 +1,218 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import random
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# ------------------ Configuration ------------------
+
+TRACE_SLOW_THRESHOLD_MS = float(os.getenv("TRACE_SLOW_THRESHOLD_MS", "2000"))
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "200"))
+# Fraction of requests whose await stacks are sampled while they run
+TRACE_PROFILE_SAMPLE_RATE = float(os.getenv("TRACE_PROFILE_SAMPLE_RATE", "0.05"))
+TRACE_PROFILE_INTERVAL_MS = float(os.getenv("TRACE_PROFILE_INTERVAL_MS", "10"))
+
+
+class Span:
+    def __init__(self, name: str, attributes: dict = None):
+        self.name = name
+        self.attributes = attributes or {}
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+        self.children: List["Span"] = []
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+    def to_dict(self, origin: float) -> dict:
+        span = {
+            "name": self.name,
+            "offset_ms": round((self.start - origin) * 1000, 2),
+            "duration_ms": round(self.duration_ms, 2),
+            "children": [child.to_dict(origin) for child in self.children]
+        }
+        if self.attributes:
+            span["attributes"] = self.attributes
+        if self.error:
+            span["error"] = self.error
+        return span
+
+
+class Trace:
+    def __init__(self, name: str, attributes: dict = None, profiled: bool = False):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.started_at = datetime.now().isoformat()
+        self.root = Span(name, attributes)
+        self.profiled = profiled
+        # Tasks that opened spans for this request; sampled by the profiler
+        self.tasks = set()
+        self.samples: Counter = Counter()
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("current_trace", default=None)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+def _await_stack(coro) -> List[str]:
+    """
+    Logical stack of a suspended coroutine, following the chain of awaits from the
+    task's entry point down to the innermost await.
+    """
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is not None:
+            frames.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}:{frame.f_lineno}")
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    return frames
+
+
+class Tracer:
+    """
+    Per-request span trees with a ring buffer of slow requests.
+
+    The middleware opens a root span per request; `span()` and `traced()` add child
+    spans from any handler or helper running in that request's context and are no-ops
+    outside one. Requests slower than `slow_threshold_ms` are kept, with their span
+    tree, in a bounded buffer. A sampled fraction of requests also get a stack profile:
+    every `profile_interval_ms` the await stacks of the request's tasks are recorded,
+    and the folded stacks are counted.
+    """
+
+    def __init__(
+        self,
+        slow_threshold_ms: float = TRACE_SLOW_THRESHOLD_MS,
+        buffer_size: int = TRACE_BUFFER_SIZE,
+        profile_sample_rate: float = TRACE_PROFILE_SAMPLE_RATE,
+        profile_interval_ms: float = TRACE_PROFILE_INTERVAL_MS
+    ):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.profile_sample_rate = profile_sample_rate
+        self.profile_interval_ms = profile_interval_ms
+        self.slow_requests = deque(maxlen=buffer_size)
+        self.requests = 0
+        self.slow = 0
+        self.profiled = 0
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        trace = _current_trace.get()
+        parent = _current_span.get()
+        if trace is None or parent is None:
+            yield None
+            return
+        span = Span(name, attributes)
+        parent.children.append(span)
+        if trace.profiled:
+            try:
+                trace.tasks.add(asyncio.current_task())
+            except RuntimeError:  # Sync code running in the threadpool
+                pass
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.end = time.perf_counter()
+            _current_span.reset(token)
+
+    def traced(self, name: str = None):
+        """
+        Decorator that wraps an async function in a span.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with self.span(name or func.__name__):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    async def _profile(self, trace: Trace):
+        interval = self.profile_interval_ms / 1000
+        while True:
+            await asyncio.sleep(interval)
+            for task in list(trace.tasks):
+                if task.done():
+                    trace.tasks.discard(task)
+                    continue
+                stack = _await_stack(task.get_coro())
+                if stack:
+                    trace.samples[";".join(stack)] += 1
+
+    async def trace_request(self, request, call_next):
+        """
+        Middleware body: run the request inside a root span and keep it if slow.
+        """
+        profiled = random.random() < self.profile_sample_rate
+        trace = Trace(f"{request.method} {request.url.path}", profiled=profiled)
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(trace.root)
+        profiler = None
+        if profiled:
+            # Handler tasks register themselves when they open their first span
+            profiler = asyncio.create_task(self._profile(trace))
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            response.headers["X-Trace-Id"] = trace.trace_id
+            return response
+        finally:
+            trace.root.end = time.perf_counter()
+            if profiler is not None:
+                profiler.cancel()
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            self._finish(trace, status)
+
+    def _finish(self, trace: Trace, status: int):
+        self.requests += 1
+        self.profiled += trace.profiled
+        duration_ms = trace.root.duration_ms
+        if duration_ms < self.slow_threshold_ms:
+            return
+        self.slow += 1
+        record = {
+            "trace_id": trace.trace_id,
+            "request": trace.root.name,
+            "status": status,
+            "started_at": trace.started_at,
+            "duration_ms": round(duration_ms, 2),
+            "spans": trace.root.to_dict(trace.root.start)
+        }
+        if trace.profiled:
+            record["profile"] = {
+                "interval_ms": self.profile_interval_ms,
+                "samples": sum(trace.samples.values()),
+                "stacks": [{"stack": stack, "count": count} for stack, count in trace.samples.most_common(20)]
+            }
+        self.slow_requests.append(record)
+        logger.warning(f"Slow request {trace.root.name} took {duration_ms:.0f}ms (trace {trace.trace_id})")
+
+    def slowest(self, limit: int = 10) -> List[dict]:
+        return sorted(self.slow_requests, key=lambda record: record["duration_ms"], reverse=True)[:limit]
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "slow_requests": self.slow,
+            "profiled_requests": self.profiled,
+            "buffered": len(self.slow_requests),
+            "buffer_size": self.slow_requests.maxlen,
+            "slow_threshold_ms": self.slow_threshold_ms,
+            "profile_sample_rate": self.profile_sample_rate
+        }
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from llm_client import AsyncOpenAIClient
+
+logger = logging.getLogger(__name__)
+
+# ------------------ Configuration ------------------
+
+LOCAL_WHISPER_MODEL = os.getenv("LOCAL_WHISPER_MODEL", "base.en")
+LOCAL_WHISPER_COMPUTE_TYPE = os.getenv("LOCAL_WHISPER_COMPUTE_TYPE", "int8")
+LOCAL_WHISPER_WORKERS = int(os.getenv("LOCAL_WHISPER_WORKERS", "2"))
+LOCAL_WHISPER_CPU_THREADS = int(os.getenv("LOCAL_WHISPER_CPU_THREADS", "2"))
+
+
+def _read_audio(audio) -> bytes:
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        return bytes(audio)
+    return audio.read()
+
+
+class TranscriptionBackend(ABC):
+    """
+    Interface for turning an answer recording into text.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def transcribe(self, audio, filename: str = "answer.webm", language: str = "en") -> str:
+        ...
+
+    async def aclose(self):
+        pass
+
+
+class WhisperAPIBackend(TranscriptionBackend):
+    """
+    OpenAI hosted Whisper ("whisper-1") through the shared async client.
+    """
+
+    name = "api"
+
+    def __init__(self, client: AsyncOpenAIClient):
+        self.client = client
+
+    async def transcribe(self, audio, filename: str = "answer.webm", language: str = "en") -> str:
+        return await self.client.transcribe(audio, filename=filename, language=language)
+
+
+# ------------------ Local CPU Backend ------------------
+
+# Model loaded once per worker process by _init_local_worker
+_local_model = None
+
+
+def _init_local_worker(model_size: str, compute_type: str, cpu_threads: int):
+    global _local_model
+    from faster_whisper import WhisperModel
+    _local_model = WhisperModel(model_size, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+
+
+def _transcribe_local(data: bytes, language: str) -> str:
+    import io
+    segments, _ = _local_model.transcribe(io.BytesIO(data), language=language, beam_size=1, vad_filter=True)
+    return " ".join(segment.text.strip() for segment in segments).strip()
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """
+    Quantized Whisper-family model (faster-whisper / CTranslate2, int8 by default) running
+    on the CPU in a process pool, so decoding never blocks the event loop or the GIL.
+
+    Requires the optional `faster-whisper` package.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        model_size: str = LOCAL_WHISPER_MODEL,
+        compute_type: str = LOCAL_WHISPER_COMPUTE_TYPE,
+        workers: int = LOCAL_WHISPER_WORKERS,
+        cpu_threads: int = LOCAL_WHISPER_CPU_THREADS
+    ):
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.workers = workers
+        self.cpu_threads = cpu_threads
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            logger.info(f"Starting {self.workers} local Whisper workers ({self.model_size}, {self.compute_type})")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_local_worker,
+                initargs=(self.model_size, self.compute_type, self.cpu_threads)
+            )
+        return self._executor
+
+    async def transcribe(self, audio, filename: str = "answer.webm", language: str = "en") -> str:
+        data = _read_audio(audio)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), _transcribe_local, data, language)
+
+    async def aclose(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def create_transcription_backend(name: str, client: AsyncOpenAIClient) -> TranscriptionBackend:
+    """
+    Build the backend selected by name ("api" or "local").
+    """
+    name = (name or "api").lower()
+    if name in ("api", "whisper-api", "openai"):
+        return WhisperAPIBackend(client)
+    if name in ("local", "faster-whisper"):
+        return LocalWhisperBackend()
+    raise ValueError(f"Unknown transcription backend: {name}")
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import logging
+from typing import Tuple
+
+# Kept free of sibling-module imports so both Candidate/main.py and Backend/script.py can use it
+
+logger = logging.getLogger(__name__)
+
+CV_MAX_BYTES = 5 * 1024 * 1024  # 5MB
+# Allowance for multipart boundaries and headers when pre-checking Content-Length
+MULTIPART_OVERHEAD = 64 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Leading bytes every valid file of each type must start with
+CV_MAGIC_BYTES = {
+    "pdf": (b"%PDF-",),
+    "docx": (b"PK\x03\x04",),  # OOXML is a zip container
+    "doc": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),  # OLE2 compound file
+}
+
+
+class UploadRejected(Exception):
+    """
+    Raised while streaming an upload that must be refused.
+    """
+
+    def __init__(self, detail: str, status_code: int = 400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+async def ingest_cv_upload(file, extension: str, blob_store, max_bytes: int = CV_MAX_BYTES,
+                           chunk_size: int = UPLOAD_CHUNK_SIZE) -> Tuple[str, int, bool]:
+    """
+    Copy an UploadFile into the blob store chunk by chunk, counting and hashing as it goes.
+
+    Starlette has already spooled the multipart body by the time this runs (its size is
+    capped while receiving by UploadSizeLimitMiddleware), so this bounds the copy, not
+    the transfer. The copy stops as soon as the first bytes do not match the expected file
+    type or the size crosses `max_bytes`, holding at most one chunk in memory.
+    Returns (sha256, size, created).
+    """
+    writer = blob_store.writer()
+    try:
+        head = b""
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            if len(head) < 8:
+                head += chunk[:8 - len(head)]
+                if len(head) >= 8 and not head.startswith(CV_MAGIC_BYTES.get(extension, (b"",))):
+                    raise UploadRejected(f"File content does not look like a {extension.upper()} document.")
+            if writer.size + len(chunk) > max_bytes:
+                raise UploadRejected(f"File size too large. Maximum size is {max_bytes // (1024 * 1024)}MB")
+            writer.write(chunk)
+
+        if not head.startswith(CV_MAGIC_BYTES.get(extension, (b"",))):
+            raise UploadRejected(f"File content does not look like a {extension.upper()} document.")
+        digest, created = await asyncio.to_thread(writer.commit)
+        return digest, writer.size, created
+    except BaseException:
+        writer.abort()
+        raise
+
+
+class BodyTooLarge(Exception):
+    """
+    Raised from the wrapped `receive` once a request body crosses the size limit.
+    """
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware that caps request bodies on the upload paths while they are received.
+
+    Starlette reads and spools the whole multipart body before a handler runs, so the
+    cap cannot live in the handler. Requests declaring a Content-Length that is too
+    large are refused before any body is read. Chunked requests, which have no
+    Content-Length, are cut off as soon as the bytes received cross the limit. Either
+    way the client gets a 413 instead of whatever error the interrupted handler produced.
+    """
+
+    def __init__(self, app, paths=("/upload",), max_bytes: int = CV_MAX_BYTES):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_bytes = max_bytes
+        self.detail = f"File size too large. Maximum size is {max_bytes // (1024 * 1024)}MB"
+
+    async def _reject(self, send):
+        body = json.dumps({"detail": self.detail}).encode()
+        await send({"type": "http.response.start", "status": 413,
+                    "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        if content_length_exceeds(headers, self.max_bytes):
+            await self._reject(send)
+            return
+
+        limit = self.max_bytes + MULTIPART_OVERHEAD
+        state = {"received": 0, "exceeded": False, "started": False}
+
+        async def limited_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                state["received"] += len(message.get("body", b""))
+                if state["received"] > limit:
+                    state["exceeded"] = True
+                    raise BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            # Drop the app's response to the interrupted body; the 413 is sent below
+            if state["exceeded"]:
+                return
+            state["started"] = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except BodyTooLarge:
+            pass
+        if state["exceeded"]:
+            logger.warning(f"Refused upload to {scope['path']} after {state['received']} bytes")
+            if not state["started"]:
+                await self._reject(send)
+
+
+def content_length_exceeds(headers, max_bytes: int = CV_MAX_BYTES) -> bool:
+    """
+    True when a request declares a body too large to hold a `max_bytes` file, so it can
+    be refused before any of the body is read.
+    """
+    try:
+        return int(headers.get("content-length", 0)) > max_bytes + MULTIPART_OVERHEAD
+    except ValueError:
+        return False
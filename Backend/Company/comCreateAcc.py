@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -15,6 +15,7 @@ load_dotenv()
 
 # Initialize FastAPI app
 app = FastAPI()
+router = APIRouter()  # Endpoints; also mounted by server.py
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -72,7 +73,7 @@ async def save_company_to_db(company_data):
     return company_data
 
 # Company registration route
-@app.post("/auth/company/register")
+@router.post("/auth/company/register")
 async def register_company(data: CompanyModel):
     logger.info(f"Received company registration: {data.email}, {data.company_name}")
 
@@ -103,7 +104,7 @@ async def register_company(data: CompanyModel):
     return {"message": "Company registration successful", "company": result}
 
 # Google OAuth route
-@app.post("/companies/auth/google")
+@router.post("/companies/auth/google")
 async def company_google_auth(data: TokenModel):
     """
     Authenticate companies using Google OAuth.
@@ -132,7 +133,7 @@ async def company_google_auth(data: TokenModel):
         raise HTTPException(status_code=500, detail=f"Error during Google authentication: {str(e)}")
 
 # GitHub OAuth route
-@app.post("/companies/auth/github")
+@router.post("/companies/auth/github")
 async def company_github_auth(auth_request: GitHubAuthRequest):
     """
     Authenticate companies using GitHub OAuth.
@@ -186,6 +187,8 @@ async def company_github_auth(auth_request: GitHubAuthRequest):
         "company": company_data
     }
 
+app.include_router(router)
+
 # Run the server with uvicorn on all interfaces for external access
 if __name__ == "__main__":
     import uvicorn
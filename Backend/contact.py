@@ -1,8 +1,9 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import APIRouter, FastAPI, HTTPException, Request
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel, EmailStr
 from dotenv import load_dotenv
 import os
+import time
 from bson import ObjectId
 import logging
 from fastapi.middleware.cors import CORSMiddleware
@@ -16,6 +17,7 @@ load_dotenv()
 
 # Initialize FastAPI
 app = FastAPI()
+router = APIRouter()  # Endpoints; also mounted by server.py
 
 # Add CORS middleware (allow your frontend domain)
 app.add_middleware(
@@ -32,6 +34,33 @@ client = AsyncIOMotorClient(mongo_uri)
 db = client["Contact"]
 collection = db["users"]
 
+# Result of the last connection check. While the database is down the contact routes
+# answer 503 (re-checking at most every DB_RECHECK_SECONDS) instead of failing startup
+# for every app mounted next to them in server.py.
+mongo_available = False
+last_db_check = 0.0
+DB_RECHECK_SECONDS = float(os.getenv("CONTACT_DB_RECHECK_SECONDS", "30"))
+
+
+async def check_db() -> bool:
+    global mongo_available, last_db_check
+    last_db_check = time.monotonic()
+    try:
+        await client.server_info()  # Will raise an exception if unable to connect
+        mongo_available = True
+        logger.info("MongoDB connection established successfully.")
+    except Exception as e:
+        mongo_available = False
+        logger.error(f"MongoDB connection failed: {e}")
+    return mongo_available
+
+
+async def require_db():
+    if mongo_available:
+        return
+    if time.monotonic() - last_db_check < DB_RECHECK_SECONDS or not await check_db():
+        raise HTTPException(status_code=503, detail="Contact service is temporarily unavailable")
+
 # Define Pydantic model for request validation
 class User(BaseModel):
     email: EmailStr  # Email validation
@@ -39,8 +68,9 @@ class User(BaseModel):
 
 # API Route to get all users
 # API Route to create a new user
-@app.post("/register")
+@router.post("/register")
 async def register_user(user: User):
+    await require_db()
     # Insert into MongoDB without checking if user already exists
     user_data = user.dict()  # Convert model to dictionary with all fields
     try:
@@ -57,14 +87,10 @@ def convert_objectid(obj):
         return str(obj)
     return obj
 
-@app.on_event("startup")
+@router.on_event("startup")
 async def startup_db():
-    try:
-        await client.server_info()  # Will raise an exception if unable to connect
-        logger.info("MongoDB connection established successfully.")
-    except Exception as e:
-        logger.error(f"MongoDB connection failed: {e}")
-        raise HTTPException(status_code=500, detail="MongoDB connection failed")
+    # Only logs a failure: server.py runs this hook for the combined app
+    await check_db()
 
 @app.middleware("http")
 async def add_mongo_id_to_json(request: Request, call_next):
@@ -80,6 +106,14 @@ async def add_mongo_id_to_json(request: Request, call_next):
         response.body_iterator = iter([data.encode('utf-8')])  # Re-encode the modified body
     return response
 
+app.include_router(router)
+
+@app.on_event("startup")
+async def require_db_at_startup():
+    # The standalone contact app has nothing else to serve, so it still refuses to start
+    if not mongo_available:
+        raise RuntimeError("MongoDB connection failed")
+
 # Run the server with uvicorn on all interfaces for external access
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,168 @@
+"""
+Compare the one-process backend (server.py) with one uvicorn process per app.
+
+Each layout is started from scratch; an app counts as up once /openapi.json answers.
+Reports per-process startup time, resident memory (RSS, and PSS where the kernel
+exposes it, which splits shared library pages fairly between processes) and thread
+count (each Motor client runs its own monitor threads), plus the totals for each layout.
+
+The standalone contact app refuses to start without MongoDB (server.py only logs
+it and answers 503 on the contact routes), so MONGO_URI must point at a reachable
+server for the layouts to be comparable.
+
+Usage (from Backend/, Linux only):
+    MONGO_URI=mongodb://127.0.0.1:27017 python measure_processes.py --repeat 3
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (label, working directory, uvicorn app)
+SEPARATE = [
+    ("interview", "Candidate", "main:app"),
+    ("candidate login", "Candidate", "canLogin:app"),
+    ("candidate signup", "Candidate", "canCreateAcc:app"),
+    ("company signup", "Company", "comCreateAcc:app"),
+    ("contact", ".", "contact:app"),
+]
+COMBINED = [("all (server.py)", ".", "server:app")]
+
+
+def proc_status(pid: int) -> dict:
+    """
+    RSS / PSS in MiB and the thread count of a running process.
+    """
+    stats = {"rss_mib": 0.0, "pss_mib": None, "threads": 0}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                stats["rss_mib"] = int(line.split()[1]) / 1024
+            elif line.startswith("Threads:"):
+                stats["threads"] = int(line.split()[1])
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    stats["pss_mib"] = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return stats
+
+
+def start(app: str, directory: str, port: int, timeout: float):
+    """
+    Launch one uvicorn process and wait until it serves requests.
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.join(BACKEND_DIR, directory),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}/openapi.json"
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"{app} exited with code {process.returncode} during startup")
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return process, time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"{app} did not start within {timeout:.0f}s")
+
+
+def measure(layout, base_port: int, timeout: float, settle: float) -> list:
+    processes, rows = [], []
+    try:
+        for offset, (label, directory, app) in enumerate(layout):
+            process, startup = start(app, directory, base_port + offset, timeout)
+            processes.append(process)
+            rows.append({"label": label, "pid": process.pid, "startup_s": startup})
+        # Let lazily started background threads and pools come up before sampling
+        time.sleep(settle)
+        for row in rows:
+            row.update(proc_status(row["pid"]))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return rows
+
+
+def totals(rows: list) -> dict:
+    pss = [row["pss_mib"] for row in rows]
+    return {
+        "processes": len(rows),
+        "startup_s": sum(row["startup_s"] for row in rows),
+        "rss_mib": sum(row["rss_mib"] for row in rows),
+        "pss_mib": sum(pss) if None not in pss else None,
+        "threads": sum(row["threads"] for row in rows),
+    }
+
+
+def fmt(value, spec: str) -> str:
+    return "n/a" if value is None else format(value, spec)
+
+
+def report(name: str, runs: list):
+    print(f"\n{name}")
+    print(f"{'app':<20} {'startup_s':>10} {'rss_mib':>9} {'pss_mib':>9} {'threads':>8}")
+    for index, first in enumerate(runs[0]):
+        rows = [run[index] for run in runs]
+        pss = [row["pss_mib"] for row in rows]
+        print(f"{first['label']:<20} {statistics.median(row['startup_s'] for row in rows):>10.2f} "
+              f"{statistics.median(row['rss_mib'] for row in rows):>9.1f} "
+              f"{fmt(statistics.median(pss) if None not in pss else None, '.1f'):>9} "
+              f"{statistics.median(row['threads'] for row in rows):>8.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure startup time and memory of both process layouts")
+    parser.add_argument("--base-port", type=int, default=8600)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per layout; medians are reported")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed for one process to start")
+    parser.add_argument("--settle", type=float, default=2, help="seconds to wait before sampling memory")
+    args = parser.parse_args()
+
+    results = {}
+    for name, layout in (("separate processes", SEPARATE), ("single process", COMBINED)):
+        runs = [measure(layout, args.base_port, args.timeout, args.settle) for _ in range(args.repeat)]
+        report(name, runs)
+        results[name] = [totals(run) for run in runs]
+
+    print(f"\n{'layout':<20} {'procs':>6} {'startup_s':>10} {'rss_mib':>9} {'pss_mib':>9} {'threads':>8}")
+    medians = {}
+    for name, runs in results.items():
+        pss = [run["pss_mib"] for run in runs]
+        medians[name] = {
+            key: statistics.median(run[key] for run in runs) for key in ("processes", "startup_s", "rss_mib", "threads")
+        }
+        medians[name]["pss_mib"] = statistics.median(pss) if None not in pss else None
+        row = medians[name]
+        print(f"{name:<20} {row['processes']:>6.0f} {row['startup_s']:>10.2f} {row['rss_mib']:>9.1f} "
+              f"{fmt(row['pss_mib'], '.1f'):>9} {row['threads']:>8.0f}")
+
+    split, single = medians["separate processes"], medians["single process"]
+    saved_pss = None if split["pss_mib"] is None else split["pss_mib"] - single["pss_mib"]
+    print(f"\nsaved: {split['rss_mib'] - single['rss_mib']:.1f} MiB RSS, {fmt(saved_pss, '.1f')} MiB PSS, "
+          f"{split['startup_s'] - single['startup_s']:.2f}s of startup, "
+          f"{split['threads'] - single['threads']:.0f} threads, "
+          f"{split['processes'] - single['processes']:.0f} processes")
+
+
+if __name__ == "__main__":
+    main()
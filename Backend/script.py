@@ -1,26 +1,34 @@
 import os
 import json
 import uuid
+import asyncio
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import logging
-from fastapi import FastAPI, HTTPException, File, UploadFile
+from fastapi import FastAPI, HTTPException, File, UploadFile, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from dotenv import load_dotenv
 import openai
-import fitz  # PyMuPDF
-import docx
-from io import BytesIO
 import requests
+from Candidate.blob_store import BlobStore
+from Candidate.cv_text import CVExtractionEngine, CVTextCache, resolve_cv_text
+from Candidate.cv_digest import build_cv_digest, estimate_tokens
+from Candidate.token_budget import TokenBudgeter
+from Candidate.upload_ingest import UploadRejected, UploadSizeLimitMiddleware, ingest_cv_upload
 
 # Load environment variables from .env file
 load_dotenv()
 
 app = FastAPI()
 
+# Cap CV bodies (uploads and CVs attached to generation requests) while they are
+# received, with or without a Content-Length (registered before CORS so CORS stays
+# the outermost middleware)
+app.add_middleware(UploadSizeLimitMiddleware, paths=("/upload", "/generate_interview_questions/"))
+
 # Add CORS middleware (allow your frontend domain)
 app.add_middleware(
     CORSMiddleware,
@@ -30,8 +38,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create a dictionary to store uploaded CVs
+# Create a dictionary to store uploaded CV metadata; the bytes live in the blob store
 uploaded_cvs = {}
+blob_store = BlobStore(os.getenv("CV_BLOB_DIR", "cv_blobs"))
+# Extracted CV text, computed once per unique document
+cv_texts = CVTextCache(blob_store, CVExtractionEngine())
 
 # OpenAI API Key (Store securely in an env variable)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")  # Make sure to set this in your .env file
@@ -46,26 +57,31 @@ if not OPENAI_API_KEY:
 else:
     logger.info("OpenAI API key loaded successfully.")
 
-# Function to extract text from PDF
-def extract_text_from_pdf(pdf_file_bytes):
-    doc = fitz.open(stream=pdf_file_bytes, filetype="pdf")
-    text = ""
-    for page in doc:
-        text += page.get_text("text")
-    return text
+# Function to get CV text for an uploaded cv_id or an attached file, extracting each document only once
+async def load_cv_text(file: Optional[UploadFile], cv_id: Optional[str]) -> str:
+    record = None
+    if cv_id:
+        record = uploaded_cvs.get(cv_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail="CV not found")
+    try:
+        return await resolve_cv_text(cv_texts, record, file)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-# Function to extract text from DOCX
-def extract_text_from_docx(docx_file_bytes):
-    doc = docx.Document(BytesIO(docx_file_bytes))
-    return "\n".join([para.text for para in doc.paragraphs])
+# Running totals of CV prompt sizes before/after digesting
+digest_stats = {"documents": 0, "raw_tokens": 0, "digest_tokens": 0}
 
-# Function to generate interview questions using OpenAI based on CV content
-def generate_interview_questions(cv_text):
+# Prompt-token budget for CV question generation; the CV digest is truncated to fit
+prompt_budget = TokenBudgeter({"cv_questions": int(os.getenv("PROMPT_BUDGET_CV_QUESTIONS", "1500"))})
+
+# Function to build the question-generation prompt for a CV digest
+def build_cv_question_messages(cv_digest):
     prompt = f"""
-    Based on the following CV, generate 5 technical interview questions related to the candidate's experience and skills:
+    Based on the following CV summary, generate 5 technical interview questions related to the candidate's experience and skills:
     
-    CV Text:
-    {cv_text}
+    CV Summary:
+    {cv_digest}
     
     Format the questions as:
     Q1: [Question]
@@ -74,16 +90,30 @@ def generate_interview_questions(cv_text):
     Q4: [Question]
     Q5: [Question]
     """
+    return [{"role": "user", "content": prompt}]
+
+# Function to generate interview questions using OpenAI based on CV content
+def generate_interview_questions(cv_text):
+    # Send a compact skills/experience digest instead of the raw CV
+    cv_digest = build_cv_digest(cv_text)
+    raw_tokens, digest_tokens = estimate_tokens(cv_text), estimate_tokens(cv_digest)
+    digest_stats["documents"] += 1
+    digest_stats["raw_tokens"] += raw_tokens
+    digest_stats["digest_tokens"] += digest_tokens
+    logger.info(f"CV digest: ~{raw_tokens} -> ~{digest_tokens} tokens")
+
+    messages = prompt_budget.fit("cv_questions", build_cv_question_messages, cv_digest)
 
     # Make the API request to OpenAI to generate questions
     response = openai.Completion.create(
         model="gpt-4",
-        prompt=prompt,
+        prompt=messages[0]["content"],
         max_tokens=300,
         temperature=0.7,
         n=1,
         stop=["\n"]
     )
+    prompt_budget.record("cv_questions", messages, 300, response)
     
     if response.status_code == 200:
         generated_questions = response.choices[0].text.strip()
@@ -95,24 +125,17 @@ def generate_interview_questions(cv_text):
 
 # API Endpoint for CV Upload and Question Generation
 @app.post("/generate_interview_questions/")
-async def generate_interview_questions_endpoint(file: UploadFile = File(...)):
-    file_extension = file.filename.split(".")[-1].lower()
-
+async def generate_interview_questions_endpoint(file: Optional[UploadFile] = File(None), cv_id: Optional[str] = Form(None)):
     try:
-        file_content = await file.read()  # Read the uploaded file content
-
-        # Process based on file type
-        if file_extension == "pdf":
-            text = extract_text_from_pdf(file_content)
-        elif file_extension == "docx":
-            text = extract_text_from_docx(file_content)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format. Use PDF or DOCX.")
+        # Use cached text for an uploaded CV (cv_id) or extract it from the attached file
+        text = await load_cv_text(file, cv_id)
 
         # Generate interview questions using the extracted CV text
         questions = generate_interview_questions(text)
         return {"questions": questions}
 
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}")
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -127,6 +150,27 @@ async def generate_interview_questions_from_text(cv_text: str):
         logger.error(f"An error occurred: {str(e)}")
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
+# API Endpoint for CV text cache counters and per-document extraction timings
+@app.get("/cv/stats")
+async def get_cv_extraction_stats():
+    raw, digest = digest_stats["raw_tokens"], digest_stats["digest_tokens"]
+    return {
+        **cv_texts.stats(),
+        "digest": {
+            **digest_stats,
+            "token_reduction": round(1 - digest / raw, 4) if raw else 0.0
+        }
+    }
+
+# API Endpoint for prompt/completion token counts and suggested max_tokens
+@app.get("/prompts/stats")
+async def get_prompt_token_stats():
+    return prompt_budget.stats()
+
+@app.on_event("shutdown")
+async def stop_cv_extraction():
+    cv_texts.engine.shutdown()
+
 # Add response model
 class UploadResponse(BaseModel):
     message: str
@@ -145,16 +189,6 @@ async def upload_cv(file: UploadFile = File(...)) -> UploadResponse:
         if not file:
             raise HTTPException(status_code=400, detail="No file provided")
             
-        # Validate file size (5MB limit)
-        file_size = 0
-        content = await file.read()
-        file_size = len(content)
-        if file_size > 5 * 1024 * 1024:  # 5MB
-            raise HTTPException(status_code=400, detail="File size too large. Maximum size is 5MB")
-            
-        # Reset file pointer
-        await file.seek(0)
-            
         # Validate file extension
         file_extension = file.filename.split(".")[-1].lower()
         if file_extension not in ["pdf", "doc", "docx"]:
@@ -179,10 +213,22 @@ async def upload_cv(file: UploadFile = File(...)) -> UploadResponse:
         # Generate a unique ID for the CV
         cv_id = str(uuid.uuid4())
 
-        # Store the CV content and metadata
+        # Stream the body into the blob store, rejecting it as soon as it is too large
+        # or its leading bytes do not match the extension; the record keeps only metadata and the hash
+        try:
+            sha256, file_size, created = await ingest_cv_upload(file, file_extension, blob_store)
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        if not created:
+            logger.info(f"CV {file.filename} matches stored blob {sha256}, reusing it")
+        if file_extension in ("pdf", "docx"):
+            # Extract the text in the background so question generation can use it immediately
+            cv_texts.schedule(sha256, file_extension)
+
+        # Store the CV metadata
         uploaded_cvs[cv_id] = {
             "filename": file.filename,
-            "content": content,
+            "sha256": sha256,
             "content_type": content_type,
             "extension": file_extension,
             "size": str(file_size),
@@ -0,0 +1,119 @@
+"""
+Serve every backend app from one process.
+
+The interview API, candidate login/signup, company signup and contact form each
+still run on their own (`uvicorn main:app` etc.), but here their routers share one
+event loop, one MongoDB client (and its connection pool and monitor threads), one
+middleware stack and a single set of startup/shutdown hooks.
+
+Routes keep their standalone paths, so the apps must not define the same path and
+method twice; a collision is a startup error rather than one app silently
+shadowing another.
+
+Usage (from Backend/):
+    uvicorn server:app --host 0.0.0.0 --port 8000
+"""
+import logging
+import os
+import sys
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.routing import APIRoute, APIWebSocketRoute
+from fastapi.staticfiles import StaticFiles
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+# The Candidate and Company modules import their siblings as top-level modules
+for directory in ("Candidate", "Company"):
+    path = os.path.join(BACKEND_DIR, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import main as interview  # noqa: E402
+import canLogin  # noqa: E402
+import canCreateAcc  # noqa: E402
+import comCreateAcc  # noqa: E402
+import contact  # noqa: E402
+from upload_ingest import UploadSizeLimitMiddleware  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+ROUTER_MODULES = [interview, canLogin, canCreateAcc, comCreateAcc, contact]
+# Modules holding a module-level Motor `client` with `db` and `collection` taken from it
+MONGO_MODULES = [canLogin, canCreateAcc, comCreateAcc, contact]
+
+
+def route_keys(route) -> set:
+    if isinstance(route, APIRoute):
+        return {(route.path, method) for method in route.methods}
+    if isinstance(route, APIWebSocketRoute):
+        return {(route.path, "WEBSOCKET")}
+    return set()
+
+
+def check_route_collisions(modules):
+    """
+    Raise if two routers define the same path and method.
+    """
+    owners = {}
+    collisions = []
+    for module in modules:
+        for route in module.router.routes:
+            for key in route_keys(route):
+                if key in owners:
+                    collisions.append(f"{key[1]} {key[0]} ({owners[key]} and {module.__name__})")
+                owners.setdefault(key, module.__name__)
+    if collisions:
+        raise RuntimeError(f"Route collisions between mounted apps: {'; '.join(collisions)}")
+
+
+def share_mongo_clients(modules) -> list:
+    """
+    Point every module at one Motor client per MongoDB URI and close the duplicates.
+    """
+    clients = {}
+    for module in modules:
+        shared = clients.setdefault(module.mongo_uri, module.client)
+        if module.client is shared:
+            continue
+        module.client.close()
+        module.client = shared
+        module.db = shared[module.db.name]
+        module.collection = module.db[module.collection.name]
+    return list(clients.values())
+
+
+def create_app() -> FastAPI:
+    check_route_collisions(ROUTER_MODULES)
+    app = FastAPI(title="Hired Backend")
+
+    # Same order as the interview app: size check, tracing, then CORS outermost
+    app.add_middleware(UploadSizeLimitMiddleware, paths=("/upload", "/generate_script"))
+    app.middleware("http")(interview.trace_requests)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.mount("/uploads", StaticFiles(directory=interview.UPLOAD_DIR), name="uploads")
+
+    for module in ROUTER_MODULES:
+        app.include_router(module.router)
+
+    mongo_clients = share_mongo_clients(MONGO_MODULES)
+
+    @app.on_event("shutdown")
+    async def close_mongo_clients():
+        for client in mongo_clients:
+            client.close()
+
+    return app
+
+
+app = create_app()
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
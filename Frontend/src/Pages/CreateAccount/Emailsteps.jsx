@@ -32,7 +32,7 @@ const EmailStep = ({ email, setEmail, error, handleNext }) => {
     setLoading(true); // Set loading to true
     setShowLoadingBox(true); // Show loading box
 
-    fetch("http://localhost:8000/auth/google", {
+    fetch("http://localhost:8000/auth/register/google", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ token: response.credential }),
@@ -66,7 +66,7 @@ const EmailStep = ({ email, setEmail, error, handleNext }) => {
     console.log("GitHub Token:", response.code);
     setShowLoadingBox(true); // Show loading box
 
-    fetch("http://localhost:8000/auth/github", {
+    fetch("http://localhost:8000/auth/register/github", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ code: response.code }), // Correct the key to 'code'
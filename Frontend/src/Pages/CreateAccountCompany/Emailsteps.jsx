@@ -23,15 +23,15 @@ const EmailStep = ({ email, setEmail, error, handleNext }) => {
     console.log("Google Token:", response.credential);
     setGoogleResponse(response);
 
-    fetch("http://localhost:8000/auth/google", {
+    fetch("http://localhost:8000/companies/auth/google", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ token: response.credential }),
     })
       .then((res) => res.json())
       .then((data) => {
-        if (data.message === "Login successful") {
-          alert("Login successful! Welcome, " + data.user.name);
+        if (data.company) {
+          alert("Login successful! Welcome, " + data.company.company_name);
         } else {
           alert("Login failed. Please try again.");
         }
@@ -45,15 +45,15 @@ const EmailStep = ({ email, setEmail, error, handleNext }) => {
   const handleGitHubLogin = (response) => {
     console.log("GitHub Token:", response.code);
 
-    fetch("http://localhost:8000/auth/github", {
+    fetch("http://localhost:8000/companies/auth/github", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ token: response.code }),
+      body: JSON.stringify({ code: response.code }),
     })
       .then((res) => res.json())
       .then((data) => {
-        if (data.message === "Login successful") {
-          alert("Login successful! Welcome, " + data.user.name);
+        if (data.company) {
+          alert("Login successful! Welcome, " + data.company.company_name);
         } else {
           alert("Login failed. Please try again.");
         }